@@ -52,6 +52,7 @@ Authors: ThePillarMen Team
         'base',
         'hr',
         'mail',
+        'bus',
         'web',
     ],
     'data': [
@@ -63,6 +64,11 @@ Authors: ThePillarMen Team
         'views/maintenance_team_views.xml',
         'views/equipment_views.xml',
         'views/maintenance_request_views.xml',
+        'views/maintenance_request_archive_views.xml',
+        'report/maintenance_request_report_views.xml',
+        'report/maintenance_reliability_views.xml',
+        'wizard/equipment_import_views.xml',
+        'wizard/preventive_scheduler_views.xml',
         'views/dashboard_views.xml',
         'views/menu_views.xml',
         # Reports
@@ -70,6 +76,7 @@ Authors: ThePillarMen Team
         # Data
         'data/email_templates.xml',
         'data/scheduled_actions.xml',
+        'data/server_actions.xml',
     ],
     'assets': {
         'web.assets_backend': [
@@ -1,5 +1,10 @@
 # -*- coding: utf-8 -*-
+from . import index_mixin
+from . import bulk_mixin
+from . import dashboard_mixin
 from . import equipment_category
 from . import maintenance_team
 from . import equipment
 from . import maintenance_request
+from . import maintenance_request_archive
+from . import ir_config_parameter
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+GearGuard Bulk Mode Mixin
+=========================
+Loads large numbers of tracked records without the mail.thread overhead.
+
+Inside bulk mode (``gearguard_bulk_mode`` in the context) creates and writes
+skip field tracking, follower auto-subscription and the per-record
+"created" chatter entry, so no mail.tracking.value / mail.message rows are
+written per record. ``bulk_create`` wraps a chunked load in that mode and
+posts a single summary message at the end.
+
+Usage:
+------
+    equipment = env['maintenance.equipment'].bulk_create(vals_list)
+    records.with_context(gearguard_bulk_mode=True).write(vals)
+"""
+from odoo import models, api
+
+
+# Context keys understood by mail.thread that suppress per-record chatter
+BULK_MODE_CONTEXT = {
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+    'mail_notrack': True,
+    'mail_auto_subscribe_no_notify': True,
+}
+
+
+class GearGuardBulkMixin(models.AbstractModel):
+    _name = 'gearguard.bulk.mixin'
+    _description = 'GearGuard Bulk Load Mode'
+
+    def _with_bulk_mode(self):
+        """Return ``self`` with chatter suppressed when bulk mode is requested."""
+        if self.env.context.get('gearguard_bulk_mode'):
+            return self.with_context(**BULK_MODE_CONTEXT)
+        return self
+
+    @api.model
+    def bulk_create(self, vals_list, batch_size=1000, summary_record=None):
+        """
+        Create records in chunks with tracking and chatter suspended.
+
+        :param vals_list: list of value dicts
+        :param batch_size: records per ``create()`` call
+        :param summary_record: record (mail.thread) receiving the summary
+            message; defaults to the current user's partner
+        :return: created records, in the caller's context
+        """
+        Model = self.with_context(gearguard_bulk_mode=True)
+        record_ids = []
+        for start in range(0, len(vals_list), batch_size):
+            record_ids += Model.create(vals_list[start:start + batch_size]).ids
+        records = self.browse(record_ids)
+        self._post_bulk_summary(len(records), summary_record)
+        return records
+
+    @api.model
+    def _post_bulk_summary(self, count, summary_record=None):
+        """Post one note summarizing a bulk load."""
+        target = summary_record or self.env.user.partner_id
+        target.message_post(
+            body=f'Bulk load: {count} {self._description} record(s) created.',
+            message_type='comment',
+            subtype_xmlid='mail.mt_note',
+        )
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+GearGuard Dashboard Notification Mixin
+======================================
+Publishes the changes of dashboard KPIs on the bus so open dashboards stay
+current without reloading their statistics.
+
+Models inheriting the mixin implement ``_dashboard_counters`` (the KPIs a
+set of records counts towards) and list in ``_dashboard_fields`` the fields
+those KPIs depend on. Creates, unlinks and writes touching these fields
+compute the KPI deltas, which are summed per transaction and sent once, at
+commit:
+
+    type:    'gearguard/dashboard_delta'
+    payload: {'deltas': {'newRequests': -1, 'inProgressRequests': 1}}
+
+Deltas only reach the users whose dashboard counts the records, so that
+dashboards match ``maintenance.request.get_dashboard_statistics`` under the
+record rules and other teams' activity is not disclosed. By default every
+GearGuard user sees every record; models with narrower read rules override
+``_dashboard_counters_by_target``.
+
+Changes made in plain SQL or by the passage of time (overdue requests) are
+not published; dashboards resynchronize periodically for those.
+"""
+from collections import Counter, defaultdict
+
+from odoo import models, api
+
+
+DASHBOARD_NOTIFICATION = 'gearguard/dashboard_delta'
+DASHBOARD_PRECOMMIT_KEY = 'gearguard.dashboard_deltas'
+
+
+def dashboard_deltas(before, after):
+    """Return ``after - before`` for two ``{target: Counter}`` mappings."""
+    deltas = defaultdict(Counter)
+    for target, counters in after.items():
+        deltas[target].update(counters)
+    for target, counters in before.items():
+        deltas[target].subtract(counters)
+    return deltas
+
+
+class GearGuardDashboardMixin(models.AbstractModel):
+    _name = 'gearguard.dashboard.mixin'
+    _description = 'GearGuard Dashboard Notifications'
+
+    _dashboard_fields = []
+
+    def _dashboard_counters(self):
+        """Return a Counter of the dashboard KPIs the records count towards."""
+        return Counter()
+
+    def _dashboard_counters_by_target(self):
+        """
+        Return ``{target: Counter}``: the KPIs of the records as counted by
+        the dashboards of each bus target, given as ``(model, id)`` so it
+        can be kept until commit.
+        """
+        group = self.env.ref('gearguard.group_gearguard_user')
+        return {('res.groups', group.id): self._dashboard_counters()}
+
+    # ---------------------------
+    # CRUD Overrides
+    # ---------------------------
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._notify_dashboard(records._dashboard_counters_by_target())
+        return records
+
+    def write(self, vals):
+        if not set(vals) & set(self._dashboard_fields):
+            return super().write(vals)
+        before = self._dashboard_counters_by_target()
+        result = super().write(vals)
+        self._notify_dashboard(dashboard_deltas(before, self._dashboard_counters_by_target()))
+        return result
+
+    def unlink(self):
+        before = self._dashboard_counters_by_target()
+        result = super().unlink()
+        self._notify_dashboard(dashboard_deltas(before, {}))
+        return result
+
+    # ---------------------------
+    # Notification
+    # ---------------------------
+    @api.model
+    def _notify_dashboard(self, deltas_by_target):
+        """Add ``{target: deltas}`` to the KPI changes sent when the transaction commits."""
+        if not any(any(deltas.values()) for deltas in deltas_by_target.values()):
+            return
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get(DASHBOARD_PRECOMMIT_KEY)
+        if pending is None:
+            pending = precommit.data[DASHBOARD_PRECOMMIT_KEY] = defaultdict(Counter)
+            env = self.env
+
+            @precommit.add
+            def send_dashboard_deltas():
+                notifications = []
+                for (model, record_id), deltas in pending.items():
+                    changed = {key: value for key, value in deltas.items() if value}
+                    if changed:
+                        notifications.append(
+                            (env[model].browse(record_id), DASHBOARD_NOTIFICATION, {'deltas': changed})
+                        )
+                if notifications:
+                    env['bus.bus']._sendmany(notifications)
+        for target, deltas in deltas_by_target.items():
+            pending[target].update(deltas)
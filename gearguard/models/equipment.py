@@ -20,33 +20,74 @@ Columns:
     - warranty_expiry: Warranty end date
     - location: Physical location
     - is_scrap: Whether equipment is scrapped
+    - preventive_interval, preventive_interval_unit: Preventive schedule
+      (falls back to the category schedule when 0)
+    - running_hours: Hour meter reading (for hour-based schedules)
     - notes: Additional notes
+    - open_request_counter, request_counter: Request counters maintained by
+      a trigger on maintenance_request in stored counter mode (see
+      maintenance_request._sync_equipment_request_counters)
     - create_date, write_date: Audit timestamps (auto)
 """
+import base64
+import binascii
+import logging
+import threading
+
 from odoo import models, fields, api
-from odoo.exceptions import ValidationError
-from datetime import date
+from odoo.exceptions import ValidationError, UserError
+from odoo.tools.image import image_process
+from odoo.tools.sql import SQL, escape_psql
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+# Days before warranty expiry at which owners are reminded
+WARRANTY_REMINDER_THRESHOLDS = (30, 14, 7, 1)
+
+# Square bounding boxes (px) of the stored image thumbnails
+IMAGE_VARIANT_SIZES = (128, 256, 1024)
+
+_logger = logging.getLogger(__name__)
 
 
 class MaintenanceEquipment(models.Model):
     _name = 'maintenance.equipment'
     _description = 'Maintenance Equipment'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = [
+        'mail.thread', 'mail.activity.mixin', 'gearguard.index.mixin', 'gearguard.bulk.mixin',
+        'gearguard.dashboard.mixin',
+    ]
     _order = 'name'
 
+    # Composite/partial indexes matching the hot queries (see gearguard.index.mixin)
+    _gearguard_indexes = [
+        # Default list/kanban: active, non-scrapped equipment by name
+        ('usable_name_idx', ['name'], 'active AND is_scrap IS NOT TRUE'),
+        # Preventive scheduler and team views
+        ('usable_team_idx', ['team_id'], 'active AND is_scrap IS NOT TRUE'),
+        # Analysis grouped by category and team
+        ('category_team_idx', ['category_id', 'team_id'], 'active'),
+        # Daily warranty status refresh
+        ('valid_warranty_idx', ['warranty_expiry'], "warranty_status = 'valid'"),
+    ]
+    # Autocomplete (name_search) matches the serial number as well as the name
+    _rec_names_search = ['name', 'serial_number']
+    # Fields the dashboard KPIs depend on (see gearguard.dashboard.mixin)
+    _dashboard_fields = ['is_scrap', 'active']
+
     # ---------------------------
     # Basic Information
     # ---------------------------
     name = fields.Char(
         string='Equipment Name',
         required=True,
-        index=True,
+        index='trigram',  # substring lookup (ilike '%...%'), see gearguard.index.mixin
         tracking=True,
         help='Name or title of the equipment'
     )
     serial_number = fields.Char(
         string='Serial Number',
-        index=True,
+        index='trigram',
         tracking=True,
         copy=False,
         help='Unique serial or asset number'
@@ -66,6 +107,10 @@ class MaintenanceEquipment(models.Model):
         attachment=True,
         help='Equipment photo'
     )
+    # Thumbnails resized from ``image`` whenever it is written (see create/write)
+    image_128 = fields.Image(string='Image 128', max_width=128, max_height=128, readonly=True)
+    image_256 = fields.Image(string='Image 256', max_width=256, max_height=256, readonly=True)
+    image_1024 = fields.Image(string='Image 1024', max_width=1024, max_height=1024, readonly=True)
     note = fields.Html(
         string='Notes',
         help='Additional notes about the equipment'
@@ -147,6 +192,7 @@ class MaintenanceEquipment(models.Model):
     )
     warranty_expiry = fields.Date(
         string='Warranty Expiry',
+        index=True,
         tracking=True,
         help='Date when warranty expires'
     )
@@ -173,6 +219,38 @@ class MaintenanceEquipment(models.Model):
         help='Original purchase cost'
     )
     
+    # ---------------------------
+    # Preventive Maintenance Schedule
+    # ---------------------------
+    preventive_interval = fields.Integer(
+        string='Preventive Interval',
+        default=0,
+        tracking=True,
+        help='Interval between preventive maintenance requests '
+             '(0 = use the category schedule)'
+    )
+    preventive_interval_unit = fields.Selection(
+        selection=[
+            ('days', 'Days'),
+            ('weeks', 'Weeks'),
+            ('hours', 'Running Hours')
+        ],
+        string='Interval Unit',
+        default='days',
+        help='Unit of the preventive maintenance interval'
+    )
+    running_hours = fields.Float(
+        string='Running Hours',
+        tracking=True,
+        help='Current hour meter reading of the equipment'
+    )
+    running_hours_last_preventive = fields.Float(
+        string='Running Hours at Last Preventive',
+        readonly=True,
+        copy=False,
+        help='Hour meter reading when the last preventive request was generated'
+    )
+
     # ---------------------------
     # Location
     # ---------------------------
@@ -207,12 +285,13 @@ class MaintenanceEquipment(models.Model):
     )
     maintenance_count = fields.Integer(
         string='Maintenance Count',
-        compute='_compute_maintenance_count',
+        compute='_compute_request_counts',
+        search='_search_maintenance_count',
         help='Number of open maintenance requests'
     )
     request_count = fields.Integer(
         string='Request Count',
-        compute='_compute_request_count',
+        compute='_compute_request_counts',
         help='Total number of maintenance requests'
     )
     
@@ -221,10 +300,17 @@ class MaintenanceEquipment(models.Model):
     # ---------------------------
     days_to_warranty_expiry = fields.Integer(
         string='Days to Warranty Expiry',
-        compute='_compute_warranty_status',
-        store=True,
+        compute='_compute_days_to_warranty_expiry',
+        search='_search_days_to_warranty_expiry',
         help='Number of days until warranty expires'
     )
+    warranty_notified_threshold = fields.Integer(
+        string='Warranty Reminder Sent',
+        readonly=True,
+        copy=False,
+        help='Smallest warranty reminder threshold (days before expiry) already '
+             'notified; 0 when no reminder was sent for the current expiry date'
+    )
 
     # ---------------------------
     # SQL Constraints
@@ -232,6 +318,8 @@ class MaintenanceEquipment(models.Model):
     _sql_constraints = [
         ('serial_number_unique', 'UNIQUE(serial_number)', 
          'Serial number must be unique! This serial number already exists.'),
+        ('preventive_interval_positive', 'CHECK(preventive_interval >= 0)',
+         'Preventive interval cannot be negative!'),
     ]
 
     # ---------------------------
@@ -261,33 +349,157 @@ class MaintenanceEquipment(models.Model):
     # ---------------------------
     @api.depends('warranty_expiry')
     def _compute_warranty_status(self):
-        """Compute warranty status based on expiry date."""
+        """
+        Compute warranty status based on expiry date.
+
+        Stored for filtering and grouping; rows whose expiry date passes are
+        flipped to 'expired' by ``_cron_refresh_warranty_status``.
+        """
         today = date.today()
         for equipment in self:
             if not equipment.warranty_expiry:
                 equipment.warranty_status = 'none'
-                equipment.days_to_warranty_expiry = 0
             elif equipment.warranty_expiry < today:
                 equipment.warranty_status = 'expired'
-                equipment.days_to_warranty_expiry = (equipment.warranty_expiry - today).days
             else:
                 equipment.warranty_status = 'valid'
-                equipment.days_to_warranty_expiry = (equipment.warranty_expiry - today).days
 
-    def _compute_maintenance_count(self):
-        """Compute number of open maintenance requests."""
+    @api.depends('warranty_expiry')
+    def _compute_days_to_warranty_expiry(self):
+        """Compute days until warranty expiry at read time (negative once expired)."""
+        today = date.today()
         for equipment in self:
-            equipment.maintenance_count = self.env['maintenance.request'].search_count([
-                ('equipment_id', '=', equipment.id),
-                ('state', 'not in', ['repaired', 'scrap'])
-            ])
+            if equipment.warranty_expiry:
+                equipment.days_to_warranty_expiry = (equipment.warranty_expiry - today).days
+            else:
+                equipment.days_to_warranty_expiry = 0
+
+    def _search_days_to_warranty_expiry(self, operator, value):
+        """
+        Translate a day count into an (indexed) domain on warranty_expiry.
+
+        Equipment without a warranty counts as 0 days, like in the compute.
+        """
+        compare = {
+            '=': lambda days: days == value,
+            '!=': lambda days: days != value,
+            '<': lambda days: days < value,
+            '<=': lambda days: days <= value,
+            '>': lambda days: days > value,
+            '>=': lambda days: days >= value,
+        }
+        if operator not in compare or isinstance(value, bool) or not isinstance(value, int):
+            raise UserError(f'Unsupported search on Days to Warranty Expiry: {operator} {value!r}')
+        domain = [('warranty_expiry', operator, date.today() + timedelta(days=value))]
+        if operator == '!=':
+            # "!=" on a date also matches empty dates; only keep them if 0 qualifies
+            domain = ['&', ('warranty_expiry', '!=', False)] + domain
+        if compare[operator](0):
+            domain = ['|', ('warranty_expiry', '=', False)] + domain
+        return domain
+
+    @api.depends('request_ids.state')
+    def _compute_request_counts(self):
+        """
+        Compute open and total request counts for the whole recordset.
+
+        Uses one grouped query over maintenance_request instead of one
+        COUNT per equipment. When the stored counter mode is enabled
+        (see ``_use_stored_request_counters``), the trigger-maintained
+        counter columns are read instead.
+        """
+        real_ids = [eid for eid in self.ids if eid]
+        if not real_ids:
+            for equipment in self:
+                equipment.maintenance_count = 0
+                equipment.request_count = 0
+            return
+
+        if self._use_stored_request_counters():
+            counts = self._read_stored_request_counters(real_ids)
+        else:
+            counts = {}
+            groups = self.env['maintenance.request']._read_group(
+                domain=[('equipment_id', 'in', real_ids)],
+                groupby=['equipment_id', 'state'],
+                aggregates=['__count'],
+            )
+            for equipment, state, count in groups:
+                open_count, total_count = counts.get(equipment.id, (0, 0))
+                if state not in ('repaired', 'scrap'):
+                    open_count += count
+                counts[equipment.id] = (open_count, total_count + count)
 
-    def _compute_request_count(self):
-        """Compute total number of maintenance requests."""
         for equipment in self:
-            equipment.request_count = self.env['maintenance.request'].search_count([
-                ('equipment_id', '=', equipment.id),
-            ])
+            open_count, total_count = counts.get(equipment._origin.id or equipment.id, (0, 0))
+            equipment.maintenance_count = open_count
+            equipment.request_count = total_count
+
+    def _search_maintenance_count(self, operator, value):
+        """
+        Allow filtering on the number of open requests (e.g. "Has Open Requests").
+
+        Returns a subquery domain: only the open requests are grouped, and
+        equipment without any counts as 0.
+        """
+        compare = {
+            '=': lambda count: count == value,
+            '!=': lambda count: count != value,
+            '<': lambda count: count < value,
+            '<=': lambda count: count <= value,
+            '>': lambda count: count > value,
+            '>=': lambda count: count >= value,
+        }
+        if operator not in compare or isinstance(value, bool) or not isinstance(value, int):
+            raise UserError(f'Unsupported search on Maintenance Count: {operator} {value!r}')
+        self.env['maintenance.request'].flush_model(['equipment_id', 'state', 'active'])
+        having = SQL("COUNT(*) %s %s", SQL(operator), value)
+        if compare[operator](0):
+            # Equipment without open requests matches: exclude the groups that don't
+            membership, having = SQL("NOT IN"), SQL("NOT (%s)", having)
+        else:
+            membership = SQL("IN")
+        query = self.with_context(active_test=False)._search([])
+        query.add_where(SQL("""
+            %s %s (
+                SELECT equipment_id
+                  FROM maintenance_request
+                 WHERE equipment_id IS NOT NULL
+                   AND state IN ('new', 'in_progress')
+                   AND active
+              GROUP BY equipment_id
+                HAVING %s
+            )
+        """, SQL.identifier(query.table, 'id'), membership, having))
+        return [('id', 'in', query)]
+
+    @api.model
+    def _use_stored_request_counters(self):
+        """
+        Return True when the stored, trigger-maintained counter mode is on.
+
+        Enabled with the system parameter
+        ``gearguard.stored_request_counters`` for fleets with a very large
+        request history, where even a grouped COUNT becomes noticeable.
+        """
+        param = self.env['ir.config_parameter'].sudo().get_param(
+            'gearguard.stored_request_counters', 'False'
+        )
+        return param.lower() in ('1', 'true', 'yes')
+
+    def _read_stored_request_counters(self, equipment_ids):
+        """Read the counter columns maintained by the maintenance_request trigger."""
+        # Pending ORM writes must reach the database so the trigger fires
+        self.env['maintenance.request'].flush_model(['equipment_id', 'state'])
+        self.env.cr.execute("""
+            SELECT id, open_request_counter, request_counter
+              FROM maintenance_equipment
+             WHERE id IN %s
+        """, [tuple(equipment_ids)])
+        return {
+            row[0]: (row[1] or 0, row[2] or 0)
+            for row in self.env.cr.fetchall()
+        }
 
     # ---------------------------
     # Onchange Methods
@@ -307,14 +519,163 @@ class MaintenanceEquipment(models.Model):
         if self.employee_id and self.employee_id.department_id:
             self.department_id = self.employee_id.department_id
 
+    # ---------------------------
+    # Dashboard
+    # ---------------------------
+    def _dashboard_counters(self):
+        """Count the active equipment towards the dashboard equipment KPIs."""
+        counters = Counter()
+        for equipment in self.filtered('active'):
+            counters['totalEquipment'] += 1
+            counters['scrappedEquipment' if equipment.is_scrap else 'activeEquipment'] += 1
+        return counters
+
+    # ---------------------------
+    # Image Thumbnails
+    # ---------------------------
+    @api.model
+    def _image_variants(self, image):
+        """
+        Return ``{field: thumbnail}`` for a base64 ``image``, resized once
+        here so the Image fields store them as they are.
+
+        :raise UserError: when the data is not a decodable image
+        """
+        try:
+            source = base64.b64decode(image)
+        except (binascii.Error, ValueError) as error:
+            raise UserError('This file could not be decoded as an image file.') from error
+        return {
+            f'image_{size}': base64.b64encode(image_process(source, size=(size, size), verify_resolution=True))
+            for size in IMAGE_VARIANT_SIZES
+        }
+
+    def _prepare_image_variants(self, vals):
+        """
+        Add the thumbnails of a new ``image`` to ``vals``, once per photo
+        change. ``image`` is a plain Binary field: data that is not a
+        decodable image is still saved, without thumbnails.
+        """
+        if 'image' not in vals:
+            return
+        variants = dict.fromkeys((f'image_{size}' for size in IMAGE_VARIANT_SIZES), False)
+        if vals['image']:
+            try:
+                variants = self._image_variants(vals['image'])
+            except UserError:
+                _logger.warning(
+                    "Equipment %s: photo is not a decodable image, thumbnails not stored",
+                    self.ids or vals.get('name'),
+                )
+        vals.update(variants)
+
+    @api.model
+    def _cron_backfill_image_variants(self, batch_size=100):
+        """
+        Cron job: Store the thumbnails missing for photos saved before they
+        were kept on write.
+
+        The photos of each chunk of ``batch_size`` equipment are read with
+        one query and the thumbnail attachments created with one
+        ``create()``; photos that are not decodable images are skipped and
+        logged.
+        """
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        variant_fields = [f'image_{size}' for size in IMAGE_VARIANT_SIZES]
+        self.env.cr.execute("""
+            SELECT a.res_id
+              FROM ir_attachment a
+             WHERE a.res_model = %s
+               AND a.res_field = 'image'
+               AND (SELECT COUNT(*) FROM ir_attachment t
+                     WHERE t.res_model = a.res_model
+                       AND t.res_id = a.res_id
+                       AND t.res_field = ANY(%s)) < %s
+          ORDER BY a.res_id
+        """, [self._name, variant_fields, len(variant_fields)])
+        equipment_ids = [row[0] for row in self.env.cr.fetchall()]
+        Attachment = self.env['ir.attachment'].sudo()
+        Equipment = self.with_context(active_test=False, bin_size=False)
+
+        for start in range(0, len(equipment_ids), batch_size):
+            chunk = Equipment.browse(equipment_ids[start:start + batch_size])
+            attachment_vals = []
+            for equipment in chunk:
+                try:
+                    variants = self._image_variants(equipment.image)
+                except UserError:
+                    _logger.warning("Equipment %s: photo is not a decodable image, thumbnails not stored",
+                                    equipment.id)
+                    continue
+                attachment_vals.extend({
+                    'name': field_name,
+                    'res_model': self._name,
+                    'res_field': field_name,
+                    'res_id': equipment.id,
+                    'type': 'binary',
+                    'datas': value,
+                } for field_name, value in variants.items())
+            done_ids = list({vals['res_id'] for vals in attachment_vals})
+            Attachment.search([
+                ('res_model', '=', self._name),
+                ('res_field', 'in', variant_fields),
+                ('res_id', 'in', done_ids),
+            ]).unlink()
+            Attachment.create(attachment_vals)
+            chunk.invalidate_recordset(variant_fields)
+            if auto_commit:
+                self.env.cr.commit()
+        return True
+
     # ---------------------------
     # CRUD Overrides
     # ---------------------------
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Create equipment, suspending chatter in bulk mode."""
+        self = self._with_bulk_mode()
+        for vals in vals_list:
+            self._prepare_image_variants(vals)
+        return super().create(vals_list)
+
     def write(self, vals):
         """Track scrap date when equipment is marked as scrapped."""
-        if vals.get('is_scrap') and not self.is_scrap:
-            vals['scrap_date'] = date.today()
-        return super().write(vals)
+        self = self._with_bulk_mode()
+        # A new expiry date restarts the warranty reminder sequence
+        if 'warranty_expiry' in vals and 'warranty_notified_threshold' not in vals:
+            vals['warranty_notified_threshold'] = 0
+        newly_scrapped = self.browse()
+        if vals.get('is_scrap') and 'scrap_date' not in vals:
+            newly_scrapped = self.filtered(lambda e: not e.is_scrap)
+            if newly_scrapped == self:
+                vals['scrap_date'] = date.today()
+                newly_scrapped = self.browse()
+        self._prepare_image_variants(vals)
+        result = super().write(vals)
+        if newly_scrapped:
+            super(MaintenanceEquipment, newly_scrapped).write({'scrap_date': date.today()})
+        return result
+
+    @api.ondelete(at_uninstall=False)
+    def _unlink_except_archived_requests(self):
+        """
+        Archived requests keep their equipment_id without a foreign key:
+        enforce the ``ondelete='restrict'`` of maintenance requests for them.
+        """
+        if not self.ids:
+            return
+        self.env.cr.execute("""
+            SELECT DISTINCT e.name
+              FROM maintenance_request_archive a
+              JOIN maintenance_equipment e ON e.id = a.equipment_id
+             WHERE a.equipment_id = ANY(%s)
+        """, [self.ids])
+        names = [row[0] for row in self.env.cr.fetchall()]
+        if names:
+            raise UserError(
+                'Cannot delete equipment with archived maintenance requests: '
+                f'{", ".join(names)}. Please archive the equipment instead.'
+            )
 
     # ---------------------------
     # Actions / Smart Buttons
@@ -355,72 +716,291 @@ class MaintenanceEquipment(models.Model):
 
     def action_mark_scrap(self):
         """Mark equipment as scrapped."""
-        self.ensure_one()
+        return self._scrap_batch()
+
+    def _scrap_batch(self, bodies=None):
+        """
+        Scrap and archive all equipment in ``self`` at once.
+
+        Runs a single write for the whole set (stamping ``scrap_date`` on
+        equipment not already scrapped) and logs one chatter note per
+        equipment in a batched insert.
+
+        :param bodies: optional ``{equipment_id: message}`` mapping; a generic
+            message is logged for equipment missing from it
+        """
+        if not self:
+            return True
         self.write({
             'is_scrap': True,
             'active': False,
         })
-        self.message_post(body='Equipment marked as SCRAP and archived.')
+        bodies = bodies or {}
+        self._message_log_batch(bodies={
+            equipment_id: bodies.get(equipment_id, 'Equipment marked as SCRAP and archived.')
+            for equipment_id in self.ids
+        })
+        return True
 
     # ---------------------------
     # Scheduled Actions (Cron Jobs)
     # ---------------------------
+    @api.model
+    def _cron_refresh_warranty_status(self):
+        """
+        Cron job: Expire warranties whose expiry date has passed.
+
+        A single UPDATE touches only equipment still marked 'valid' with an
+        expiry date before today (served by a partial index), instead of
+        recomputing the whole equipment table.
+        """
+        self.flush_model(['warranty_expiry', 'warranty_status'])
+        self.env.cr.execute("""
+            UPDATE maintenance_equipment
+               SET warranty_status = 'expired'
+             WHERE warranty_status = 'valid'
+               AND warranty_expiry < %s
+         RETURNING id
+        """, [date.today()])
+        expired_ids = [row[0] for row in self.env.cr.fetchall()]
+        if expired_ids:
+            self.browse(expired_ids).invalidate_recordset(['warranty_status'])
+        return True
+
     @api.model
     def _cron_check_warranty_expiry(self):
         """
         Cron job: Check for equipment with expiring warranty.
         Sends notifications for equipment with warranty expiring in 30 days.
+
+        Expiring equipment is fetched with one query and bucketed by the
+        reminder thresholds (30/14/7/1 days). Each bucket gets one batched
+        chatter insert, and owners receive one queued digest email listing
+        all their equipment. ``warranty_notified_threshold`` records the last
+        threshold notified, so reruns on the same day do no work.
         """
-        from datetime import timedelta
-        
         today = date.today()
-        warning_date = today + timedelta(days=30)
-        
-        expiring_equipment = self.search([
-            ('warranty_expiry', '>', today),
-            ('warranty_expiry', '<=', warning_date),
-            ('is_scrap', '=', False),
-        ])
-        
-        template = self.env.ref('gearguard.email_template_warranty_expiring', raise_if_not_found=False)
-        if template:
-            for equipment in expiring_equipment:
-                equipment.message_post(
-                    body=f'⏰ Warranty expiring in {equipment.days_to_warranty_expiry} days!',
-                    message_type='notification',
-                )
-                if equipment.owner_user_id:
-                    template.send_mail(equipment.id, force_send=True)
+        self.flush_model(['warranty_expiry', 'warranty_notified_threshold',
+                          'owner_id', 'owner_user_id', 'is_scrap', 'active'])
+        self.env.cr.execute("""
+            SELECT id,
+                   COALESCE(owner_id, owner_user_id),
+                   warranty_expiry - %s,
+                   COALESCE(warranty_notified_threshold, 0)
+              FROM maintenance_equipment
+             WHERE active
+               AND NOT COALESCE(is_scrap, FALSE)
+               AND warranty_expiry > %s
+               AND warranty_expiry <= %s
+        """, [today, today, today + timedelta(days=max(WARRANTY_REMINDER_THRESHOLDS))])
+
+        buckets = defaultdict(dict)
+        equipment_by_owner = defaultdict(list)
+        for equipment_id, owner_id, days_left, notified in self.env.cr.fetchall():
+            threshold = min(t for t in WARRANTY_REMINDER_THRESHOLDS if days_left <= t)
+            if notified and notified <= threshold:
+                continue
+            buckets[threshold][equipment_id] = f'⏰ Warranty expiring in {days_left} days!'
+            if owner_id:
+                equipment_by_owner[owner_id].append(equipment_id)
+
+        for threshold, bodies in buckets.items():
+            equipment = self.browse(list(bodies))
+            equipment._message_log_batch(bodies=bodies)
+            equipment.write({'warranty_notified_threshold': threshold})
+
+        self._queue_warranty_digests(equipment_by_owner)
         return True
 
     @api.model
-    def _cron_generate_preventive_maintenance(self):
+    def _queue_warranty_digests(self, equipment_by_owner):
+        """
+        Queue one warranty digest per owner.
+
+        :param equipment_by_owner: ``{owner_user_id: [equipment_id, ...]}``
+        """
+        email_from = self.env.company.email_formatted or self.env.user.email_formatted
+        mail_values = []
+        for owner_id, equipment_ids in equipment_by_owner.items():
+            partner = self.env['res.users'].browse(owner_id).partner_id
+            if not partner.email:
+                continue
+            equipment = self.browse(equipment_ids).sorted('warranty_expiry')
+            mail_values.append({
+                'subject': f'⏰ Warranty expiring soon on {len(equipment)} equipment',
+                'body_html': self.env['ir.qweb']._render('gearguard.email_body_warranty_digest', {
+                    'recipient': partner,
+                    'equipment': equipment,
+                    'today': date.today(),
+                }),
+                'email_from': email_from,
+                'recipient_ids': [(4, partner.id)],
+                'auto_delete': True,
+            })
+        return self.env['mail.mail'].sudo().create(mail_values)
+
+    @api.model
+    def _cron_generate_preventive_maintenance(self, lead_days=7, batch_size=1000):
         """
         Cron job: Auto-generate preventive maintenance requests.
         Creates scheduled maintenance for equipment based on category settings.
+
+        The schedule of an equipment is its own ``preventive_interval`` or,
+        when 0, the one of its category. Equipment due within ``lead_days``
+        is found with a single query, which also excludes equipment that
+        already has an open preventive request. The new requests are then
+        created with one ``create()`` call per chunk of ``batch_size``,
+        without a scheduled date nor technician: the preventive planner
+        (``maintenance.request._cron_schedule_preventive_requests``) books
+        them into the free hours of the team's technicians.
         """
-        # Find equipment that needs preventive maintenance
-        # This is a placeholder - can be enhanced with maintenance schedule settings
-        equipment_list = self.search([
-            ('is_scrap', '=', False),
-            ('team_id', '!=', False),
-        ])
-        
-        # Log action
-        for equipment in equipment_list:
-            # Check if there's already a pending preventive maintenance request
-            existing = self.env['maintenance.request'].search([
-                ('equipment_id', '=', equipment.id),
-                ('request_type', '=', 'preventive'),
-                ('state', 'in', ['new', 'in_progress']),
-            ], limit=1)
-            
-            if not existing:
-                # Can create preventive maintenance based on schedule
-                # This is a placeholder for more complex scheduling logic
-                pass
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        due = self._get_preventive_due_equipment(lead_days)
+        Request = self.env['maintenance.request'].with_context(
+            tracking_disable=True,
+            mail_create_nosubscribe=True,
+            gearguard_defer_assignment=True,
+        )
+
+        for start in range(0, len(due), batch_size):
+            chunk = due[start:start + batch_size]
+            equipment = self.browse([row[0] for row in chunk])
+            vals_list = []
+            for (equipment_id, _due_date), record in zip(chunk, equipment):
+                vals_list.append({
+                    'name': f'Preventive maintenance: {record.name}',
+                    'equipment_id': equipment_id,
+                    'category_id': record.category_id.id,
+                    'team_id': record.team_id.id,
+                    'request_type': 'preventive',
+                })
+            Request.create(vals_list)
+
+            # Reset the hour meter baseline of the generated equipment
+            self.env.cr.execute("""
+                UPDATE maintenance_equipment
+                   SET running_hours_last_preventive = running_hours
+                 WHERE id IN %s
+            """, [tuple(equipment.ids)])
+            equipment.invalidate_recordset(['running_hours_last_preventive'])
+            if auto_commit:
+                self.env.cr.commit()
         return True
 
+    @api.model
+    def _get_preventive_due_equipment(self, lead_days=7):
+        """
+        Return ``[(equipment_id, due_datetime)]`` for active equipment whose
+        preventive maintenance falls due within ``lead_days``.
+
+        Time-based schedules are counted from the last preventive request
+        (or the purchase/creation date); hour-based schedules compare the
+        hour meter with its reading at the last generated request.
+        """
+        self.flush_model()
+        self.env['equipment.category'].flush_model(['preventive_interval', 'preventive_interval_unit'])
+        self.env['maintenance.request'].flush_model(
+            ['equipment_id', 'request_type', 'state', 'scheduled_date', 'request_date', 'active']
+        )
+        self.env.cr.execute("""
+            WITH schedule AS (
+                SELECT e.id,
+                       COALESCE(e.running_hours, 0) - COALESCE(e.running_hours_last_preventive, 0) AS hours_used,
+                       COALESCE(e.purchase_date::timestamp, e.create_date) AS start_date,
+                       CASE WHEN e.preventive_interval > 0
+                            THEN e.preventive_interval ELSE c.preventive_interval END AS interval,
+                       CASE WHEN e.preventive_interval > 0
+                            THEN e.preventive_interval_unit ELSE c.preventive_interval_unit END AS unit
+                  FROM maintenance_equipment e
+             LEFT JOIN equipment_category c ON c.id = e.category_id
+                 WHERE e.active
+                   AND NOT COALESCE(e.is_scrap, FALSE)
+                   AND e.team_id IS NOT NULL
+                   AND NOT EXISTS (
+                        SELECT 1
+                          FROM maintenance_request r
+                         WHERE r.equipment_id = e.id
+                           AND r.request_type = 'preventive'
+                           AND r.state IN ('new', 'in_progress')
+                           AND r.active
+                   )
+            ),
+            last_preventive AS (
+                SELECT r.equipment_id, MAX(COALESCE(r.scheduled_date, r.request_date)) AS last_date
+                  FROM maintenance_request r
+                  JOIN schedule s ON s.id = r.equipment_id
+                 WHERE r.request_type = 'preventive'
+                   AND s.unit IN ('days', 'weeks')
+              GROUP BY r.equipment_id
+            ),
+            due AS (
+                SELECT s.id,
+                       CASE s.unit
+                            WHEN 'hours' THEN
+                                CASE WHEN s.hours_used >= s.interval THEN NOW() AT TIME ZONE 'UTC' END
+                            WHEN 'weeks' THEN
+                                COALESCE(lp.last_date, s.start_date) + s.interval * INTERVAL '7 days'
+                            ELSE
+                                COALESCE(lp.last_date, s.start_date) + s.interval * INTERVAL '1 day'
+                       END AS due_date
+                  FROM schedule s
+             LEFT JOIN last_preventive lp ON lp.equipment_id = s.id
+                 WHERE s.interval > 0
+            )
+            SELECT id, due_date
+              FROM due
+             WHERE due_date <= (NOW() AT TIME ZONE 'UTC') + %s * INTERVAL '1 day'
+          ORDER BY id
+        """, [lead_days])
+        return self.env.cr.fetchall()
+
+    # ---------------------------
+    # Lookup
+    # ---------------------------
+    @api.model
+    def search_typeahead(self, term, limit=8):
+        """
+        Ranked equipment lookup for typeahead widgets.
+
+        Matches ``term`` anywhere in the name or serial number (served by the
+        trigram indexes) and ranks exact matches first, then prefix matches,
+        then by trigram similarity when pg_trgm is installed. Access rules
+        apply through ``_search``.
+
+        :param term: text typed by the user
+        :param limit: maximum number of results
+        :return: list of dicts with id, name and serial_number
+        """
+        term = (term or '').strip()
+        if not term:
+            return []
+        query = self._search(['|', ('name', 'ilike', term), ('serial_number', 'ilike', term)])
+        prefix = f'{escape_psql(term)}%'
+        if self.env.registry.has_trigram:
+            similarity = SQL(
+                "GREATEST(similarity(COALESCE(e.name, ''), %s), "
+                "similarity(COALESCE(e.serial_number, ''), %s)) DESC",
+                term, term,
+            )
+        else:
+            similarity = SQL("LENGTH(e.name)")
+        self.env.cr.execute(SQL("""
+            SELECT e.id, e.name, e.serial_number
+              FROM maintenance_equipment e
+             WHERE e.id IN (%s)
+          ORDER BY CASE WHEN LOWER(e.serial_number) = LOWER(%s) OR LOWER(e.name) = LOWER(%s) THEN 0
+                        WHEN e.serial_number ILIKE %s OR e.name ILIKE %s THEN 1
+                        ELSE 2
+                   END,
+                   %s,
+                   e.name, e.id
+             LIMIT %s
+        """, query.subselect(), term, term, prefix, prefix, similarity, limit))
+        return [
+            {'id': equipment_id, 'name': name, 'serial_number': serial_number or ''}
+            for equipment_id, name, serial_number in self.env.cr.fetchall()
+        ]
+
     # ---------------------------
     # Reporting Methods
     # ---------------------------
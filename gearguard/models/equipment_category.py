@@ -12,6 +12,8 @@ Columns:
     - name: Category name (VARCHAR, required, unique)
     - description: Detailed description (TEXT)
     - active: Soft delete flag (BOOLEAN)
+    - preventive_interval: Default preventive maintenance interval (INTEGER)
+    - preventive_interval_unit: ENUM (days/weeks/hours)
     - create_date, write_date: Audit timestamps (auto)
 """
 from odoo import models, fields, api
@@ -42,6 +44,26 @@ class EquipmentCategory(models.Model):
         help='If unchecked, the category will be hidden but not deleted'
     )
     
+    # ---------------------------
+    # Preventive Maintenance Schedule
+    # ---------------------------
+    preventive_interval = fields.Integer(
+        string='Preventive Interval',
+        default=0,
+        help='Default interval between preventive maintenance requests for '
+             'equipment of this category (0 = no preventive schedule)'
+    )
+    preventive_interval_unit = fields.Selection(
+        selection=[
+            ('days', 'Days'),
+            ('weeks', 'Weeks'),
+            ('hours', 'Running Hours')
+        ],
+        string='Interval Unit',
+        default='days',
+        help='Unit of the preventive maintenance interval'
+    )
+
     # ---------------------------
     # Relational Fields (One2many)
     # ---------------------------
@@ -63,6 +85,8 @@ class EquipmentCategory(models.Model):
     # ---------------------------
     _sql_constraints = [
         ('name_unique', 'UNIQUE(name)', 'Category name must be unique!'),
+        ('preventive_interval_positive', 'CHECK(preventive_interval >= 0)',
+         'Preventive interval cannot be negative!'),
     ]
 
     # ---------------------------
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+GearGuard Index Mixin
+=====================
+Creates composite and partial indexes that plain ``index=True`` field
+attributes cannot express.
+
+Models inheriting the mixin declare their indexes in ``_gearguard_indexes``;
+missing ones are created when the module is installed or updated.
+
+Index declaration:
+------------------
+    (suffix, expressions, where[, method])
+    - suffix: appended to the table name to build the index name
+    - expressions: list of columns/expressions (e.g. ['priority DESC', 'id'])
+    - where: optional predicate for a partial index
+    - method: optional index method (default 'btree', e.g. 'gist')
+
+Trigram indexes:
+----------------
+    Fields declared with ``index='trigram'`` get a GIN ``gin_trgm_ops``
+    index from the ORM, so ``ilike '%...%'`` searches avoid sequential
+    scans, but only when the pg_trgm extension is installed. The mixin
+    creates the extension when the server offers it and the database user
+    may install it; otherwise those fields stay unindexed.
+"""
+import logging
+
+from odoo import models, api, tools
+from odoo.tools import sql
+
+_logger = logging.getLogger(__name__)
+
+
+class GearGuardIndexMixin(models.AbstractModel):
+    _name = 'gearguard.index.mixin'
+    _description = 'GearGuard Index Manager'
+
+    _gearguard_indexes = []
+
+    def init(self):
+        """Create the declared indexes that do not exist yet."""
+        super().init()
+        for suffix, expressions, where, *method in self._gearguard_indexes:
+            tools.create_index(
+                self.env.cr, f'{self._table}_{suffix}',
+                self._table, expressions, method=method[0] if method else 'btree',
+                where=where or '',
+            )
+        trigram_fields = [name for name, field in self._fields.items() if field.index == 'trigram']
+        if trigram_fields and self._ensure_trigram_extension():
+            self._drop_non_trigram_indexes(trigram_fields)
+
+    @api.model
+    def _ensure_trigram_extension(self):
+        """Install pg_trgm if needed and possible; return whether it is available."""
+        registry = self.env.registry
+        if registry.has_trigram:
+            return True
+        cr = self.env.cr
+        cr.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if not cr.rowcount:
+            return False
+        try:
+            with cr.savepoint(flush=False):
+                cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except Exception:
+            _logger.info("pg_trgm is not installable by this database user, trigram indexes skipped")
+            return False
+        # Field indexes are checked after init(): the ORM builds them now
+        registry.has_trigram = True
+        return True
+
+    @api.model
+    def _drop_non_trigram_indexes(self, field_names):
+        """
+        Drop plain indexes left on ``field_names`` by an earlier ``index=True``
+        declaration; the ORM only creates an index under a free name.
+        """
+        cr = self.env.cr
+        for name in field_names:
+            indexname = sql.make_index_name(self._table, name)
+            cr.execute(
+                "SELECT indexdef FROM pg_indexes WHERE indexname = %s AND tablename = %s",
+                [indexname, self._table],
+            )
+            row = cr.fetchone()
+            if row and 'gin_trgm_ops' not in row[0]:
+                sql.drop_index(cr, indexname, self._table)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+System Parameters
+=================
+Applies the GearGuard parameters that change the database setup as soon as
+they are set, instead of at the next module update.
+
+    - gearguard.stored_request_counters: installs (and backfills) or drops
+      the per-equipment request counter trigger.
+"""
+from odoo import models, api
+
+STORED_COUNTERS_PARAM = 'gearguard.stored_request_counters'
+
+
+class IrConfigParameter(models.Model):
+    _inherit = 'ir.config_parameter'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        if any(vals.get('key') == STORED_COUNTERS_PARAM for vals in vals_list):
+            self.env['maintenance.request']._sync_equipment_request_counters()
+        return records
+
+    def write(self, vals):
+        changed = STORED_COUNTERS_PARAM in self.mapped('key') or vals.get('key') == STORED_COUNTERS_PARAM
+        result = super().write(vals)
+        if changed:
+            self.env['maintenance.request']._sync_equipment_request_counters()
+        return result
+
+    def unlink(self):
+        changed = STORED_COUNTERS_PARAM in self.mapped('key')
+        result = super().unlink()
+        if changed:
+            self.env['maintenance.request']._sync_equipment_request_counters()
+        return result
@@ -22,17 +22,52 @@ Columns:
     - description: TEXT
     - create_date, write_date: Audit timestamps (auto)
 """
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.exceptions import ValidationError, UserError
+from odoo.tools.sql import SQL
+from .dashboard_mixin import dashboard_deltas
+from .scheduling import CapacityPlanner
+import threading
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 
 
 class MaintenanceRequest(models.Model):
     _name = 'maintenance.request'
     _description = 'Maintenance Request'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = [
+        'mail.thread', 'mail.activity.mixin', 'gearguard.index.mixin', 'gearguard.bulk.mixin',
+        'gearguard.dashboard.mixin',
+    ]
     _order = 'priority desc, scheduled_date asc, id desc'
 
+    # Fields the dashboard KPIs depend on (see gearguard.dashboard.mixin)
+    _dashboard_fields = ['state', 'scheduled_date', 'end_date', 'active']
+
+    # Composite/partial indexes matching the hot queries (see gearguard.index.mixin)
+    _gearguard_indexes = [
+        # Equipment smart buttons and counters
+        ('equipment_state_idx', ['equipment_id', 'state'], None),
+        # Team counters and team kanban
+        ('team_state_idx', ['team_id', 'state'], None),
+        # "My Requests", technician calendar
+        ('technician_state_scheduled_idx', ['technician_id', 'state', 'scheduled_date'], None),
+        # Kanban columns in _order
+        ('kanban_order_idx', ['state', 'priority DESC', 'scheduled_date', 'id DESC'], 'active'),
+        # Overdue lookups: open requests by scheduled date
+        ('open_scheduled_date_idx', ['scheduled_date'], "state IN ('new', 'in_progress')"),
+        # Overdue cron: open requests not yet warned about
+        ('overdue_pending_idx', ['scheduled_date'],
+         "state IN ('new', 'in_progress') AND overdue_notified_date IS NULL"),
+        # Preventive scheduler anti-join: open preventive requests per equipment
+        ('open_preventive_idx', ['equipment_id'],
+         "request_type = 'preventive' AND state IN ('new', 'in_progress')"),
+        # Interval index for technician double-booking checks and free slots
+        ('open_booking_gist_idx', ['tsrange(scheduled_date, planned_end_date)'],
+         "technician_id IS NOT NULL AND scheduled_date IS NOT NULL "
+         "AND state IN ('new', 'in_progress') AND active", 'gist'),
+    ]
+
     # ---------------------------
     # Request Information
     # ---------------------------
@@ -191,6 +226,17 @@ class MaintenanceRequest(models.Model):
         tracking=True,
         help='Actual time spent on the maintenance work'
     )
+    estimated_hours = fields.Float(
+        string='Estimated Hours',
+        default=1.0,
+        help='Expected time needed, used to balance technician workload'
+    )
+    overdue_notified_date = fields.Datetime(
+        string='Overdue Warning Date',
+        readonly=True,
+        copy=False,
+        help='When the overdue warning was logged for the current scheduled date'
+    )
     
     # ---------------------------
     # Computed Fields
@@ -198,13 +244,12 @@ class MaintenanceRequest(models.Model):
     is_overdue = fields.Boolean(
         string='Is Overdue',
         compute='_compute_is_overdue',
-        store=True,
+        search='_search_is_overdue',
         help='True if scheduled date has passed and request is not completed'
     )
     days_overdue = fields.Integer(
         string='Days Overdue',
         compute='_compute_is_overdue',
-        store=True,
         help='Number of days past the scheduled date'
     )
     color = fields.Integer(
@@ -212,6 +257,18 @@ class MaintenanceRequest(models.Model):
         compute='_compute_color',
         help='Color code for kanban cards based on priority/status'
     )
+    planned_end_date = fields.Datetime(
+        string='Planned End',
+        compute='_compute_planned_end_date',
+        inverse='_inverse_planned_end_date',
+        store=True,
+        help='Scheduled date plus the duration (or estimate) of the work'
+    )
+    has_schedule_conflict = fields.Boolean(
+        string='Double-booked',
+        compute='_compute_has_schedule_conflict',
+        help='The technician has another open request overlapping this one'
+    )
 
     # ---------------------------
     # SQL Constraints
@@ -219,8 +276,123 @@ class MaintenanceRequest(models.Model):
     _sql_constraints = [
         ('duration_positive', 'CHECK(duration >= 0)', 
          'Duration must be a positive number!'),
+        ('estimated_hours_positive', 'CHECK(estimated_hours >= 0)',
+         'Estimated hours must be a positive number!'),
     ]
 
+    # ---------------------------
+    # Database Setup
+    # ---------------------------
+    def init(self):
+        """Create the declared indexes and the per-equipment counter trigger."""
+        super().init()
+        self._init_equipment_request_counters()
+        self._init_overdue_notified_dates()
+
+    def _init_overdue_notified_dates(self):
+        """
+        Convert the former ``gearguard.overdue_check_watermark`` parameter:
+        requests scheduled up to the watermark were already warned about.
+        """
+        cr = self.env.cr
+        cr.execute("SELECT value FROM ir_config_parameter WHERE key = 'gearguard.overdue_check_watermark'")
+        row = cr.fetchone()
+        if not row:
+            return
+        watermark_date = row[0].rsplit(',', 1)[0]
+        cr.execute("""
+            UPDATE maintenance_request
+               SET overdue_notified_date = %s
+             WHERE scheduled_date <= %s
+               AND state IN ('new', 'in_progress')
+               AND overdue_notified_date IS NULL
+        """, [watermark_date, watermark_date])
+        cr.execute("DELETE FROM ir_config_parameter WHERE key = 'gearguard.overdue_check_watermark'")
+
+    def _init_equipment_request_counters(self):
+        """
+        Create the counter columns on maintenance_equipment and, when the
+        stored counter mode is enabled (``gearguard.stored_request_counters``),
+        the trigger keeping them in sync with maintenance_request.
+        """
+        cr = self.env.cr
+        for column in ('open_request_counter', 'request_counter'):
+            if not tools.column_exists(cr, 'maintenance_equipment', column):
+                tools.create_column(cr, 'maintenance_equipment', column, 'int4')
+                cr.execute(f"ALTER TABLE maintenance_equipment ALTER COLUMN {column} SET DEFAULT 0")
+        self._sync_equipment_request_counters()
+
+    @api.model
+    def _sync_equipment_request_counters(self):
+        """
+        Install or drop the counter trigger to match the stored counter mode.
+
+        The counters are only backfilled when the trigger is installed: once
+        it exists it keeps them exact, so module updates don't rescan the
+        whole request table. Turning the mode off drops the trigger, and the
+        counters are rebuilt the next time it is turned on.
+        """
+        cr = self.env.cr
+        cr.execute("""
+            SELECT 1 FROM pg_trigger
+             WHERE tgname = 'gearguard_request_counter_trg'
+               AND tgrelid = 'maintenance_request'::regclass
+        """)
+        installed = bool(cr.rowcount)
+        if not self.env['maintenance.equipment']._use_stored_request_counters():
+            if installed:
+                cr.execute("DROP TRIGGER gearguard_request_counter_trg ON maintenance_request")
+            return
+
+        cr.execute("""
+            CREATE OR REPLACE FUNCTION gearguard_request_counter() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.active THEN
+                    UPDATE maintenance_equipment
+                       SET request_counter = COALESCE(request_counter, 0) - 1,
+                           open_request_counter = COALESCE(open_request_counter, 0)
+                               - (CASE WHEN OLD.state IN ('new', 'in_progress') THEN 1 ELSE 0 END)
+                     WHERE id = OLD.equipment_id;
+                END IF;
+                IF TG_OP IN ('UPDATE', 'INSERT') AND NEW.active THEN
+                    UPDATE maintenance_equipment
+                       SET request_counter = COALESCE(request_counter, 0) + 1,
+                           open_request_counter = COALESCE(open_request_counter, 0)
+                               + (CASE WHEN NEW.state IN ('new', 'in_progress') THEN 1 ELSE 0 END)
+                     WHERE id = NEW.equipment_id;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        if installed:
+            return
+
+        # Pending ORM writes must reach the table before the backfill reads it
+        self.flush_model(['equipment_id', 'state', 'active'])
+        cr.execute("""
+            CREATE TRIGGER gearguard_request_counter_trg
+                AFTER INSERT OR DELETE OR UPDATE OF equipment_id, state, active
+                ON maintenance_request
+                FOR EACH ROW EXECUTE FUNCTION gearguard_request_counter();
+
+            UPDATE maintenance_equipment
+               SET request_counter = 0, open_request_counter = 0;
+            UPDATE maintenance_equipment e
+               SET request_counter = c.total,
+                   open_request_counter = c.open
+              FROM (
+                    SELECT equipment_id,
+                           COUNT(*) AS total,
+                           COUNT(*) FILTER (WHERE state IN ('new', 'in_progress')) AS open
+                      FROM maintenance_request
+                     WHERE active
+                  GROUP BY equipment_id
+              ) c
+             WHERE c.equipment_id = e.id
+        """)
+        self.env['maintenance.equipment'].invalidate_model(['maintenance_count', 'request_count'])
+
     # ---------------------------
     # Python Constraints
     # ---------------------------
@@ -256,10 +428,42 @@ class MaintenanceRequest(models.Model):
             else:
                 request.available_technician_ids = self.env['res.users'].search([])
 
+    @api.depends('scheduled_date', 'duration', 'estimated_hours')
+    def _compute_planned_end_date(self):
+        """
+        Compute the end of the booked slot (one hour when nothing is
+        estimated). Never before the start, which tsrange() would reject in
+        the booking index.
+        """
+        for request in self:
+            if request.scheduled_date:
+                hours = max(request.duration or request.estimated_hours or 1.0, 0.0)
+                request.planned_end_date = request.scheduled_date + timedelta(hours=hours)
+            else:
+                request.planned_end_date = False
+
+    def _inverse_planned_end_date(self):
+        """Resizing the slot (e.g. in the calendar) updates the estimate."""
+        for request in self:
+            if request.scheduled_date and request.planned_end_date and not request.duration:
+                hours = (request.planned_end_date - request.scheduled_date).total_seconds() / 3600.0
+                request.estimated_hours = max(hours, 0.0) or 1.0
+
+    def _compute_has_schedule_conflict(self):
+        """Flag requests overlapping another booking of the same technician."""
+        conflicts = self._get_schedule_conflicts()
+        for request in self:
+            request.has_schedule_conflict = bool(conflicts.get(request.id))
+
     @api.depends('scheduled_date', 'state')
     def _compute_is_overdue(self):
-        """Compute if request is overdue based on scheduled date and state."""
-        now = datetime.now()
+        """
+        Compute if request is overdue based on scheduled date and state.
+
+        Not stored: the value depends on the current time, so it is
+        evaluated at read time and never goes stale.
+        """
+        now = fields.Datetime.now()
         for request in self:
             if request.scheduled_date and request.state in ['new', 'in_progress']:
                 if request.scheduled_date < now:
@@ -272,8 +476,30 @@ class MaintenanceRequest(models.Model):
                 request.is_overdue = False
                 request.days_overdue = 0
 
+    def _search_is_overdue(self, operator, value):
+        """
+        Translate ``is_overdue`` into a domain on state and scheduled date.
+
+        Served by the partial index on scheduled_date for open requests.
+        """
+        if operator not in ('=', '!=') or not isinstance(value, bool):
+            raise UserError(f'Unsupported search on Is Overdue: {operator} {value!r}')
+        now = fields.Datetime.now()
+        if (operator == '=') == value:
+            return [('state', 'in', ['new', 'in_progress']), ('scheduled_date', '<', now)]
+        return [
+            '|', '|',
+            ('state', 'not in', ['new', 'in_progress']),
+            ('scheduled_date', '=', False),
+            ('scheduled_date', '>=', now),
+        ]
+
     def _compute_color(self):
-        """Compute color for kanban cards based on status."""
+        """
+        Compute color for kanban cards based on status.
+
+        Keep in sync with ``_color_sql``, used by ``get_kanban_data``.
+        """
         for request in self:
             if request.is_overdue:
                 request.color = 1  # Red
@@ -296,6 +522,370 @@ class MaintenanceRequest(models.Model):
         """Return all states for kanban grouping regardless of records."""
         return ['new', 'in_progress', 'repaired', 'scrap']
 
+    # ---------------------------
+    # Technician Bookings
+    # ---------------------------
+    def _get_schedule_conflicts(self):
+        """
+        Return ``{request_id: [conflicting request ids]}`` for the open,
+        scheduled requests of ``self``.
+
+        One self-join probes the GiST interval index with the range overlap
+        operator, so the cost follows the number of overlaps rather than
+        the square of the bookings.
+        """
+        request_ids = [request_id for request_id in self.ids if request_id]
+        if not request_ids:
+            return {}
+        self.flush_model(['technician_id', 'scheduled_date', 'planned_end_date', 'state', 'active'])
+        self.env.cr.execute("""
+            SELECT a.id, ARRAY_AGG(b.id ORDER BY b.scheduled_date)
+              FROM maintenance_request a
+              JOIN maintenance_request b
+                ON b.technician_id = a.technician_id
+               AND b.id <> a.id
+               AND tsrange(b.scheduled_date, b.planned_end_date)
+                   && tsrange(a.scheduled_date, a.planned_end_date)
+               AND b.scheduled_date IS NOT NULL
+               AND b.state IN ('new', 'in_progress')
+               AND b.active
+             WHERE a.id = ANY(%s)
+               AND a.scheduled_date IS NOT NULL
+               AND a.state IN ('new', 'in_progress')
+          GROUP BY a.id
+        """, [request_ids])
+        return dict(self.env.cr.fetchall())
+
+    def _log_schedule_conflicts(self):
+        """
+        Log one chatter note on each request that is now double-booked
+        (skipped in bulk mode, like the rest of the chatter).
+        """
+        if self.env.context.get('gearguard_bulk_mode'):
+            return
+        conflicts = self._get_schedule_conflicts()
+        if not conflicts:
+            return
+        others = self.sudo().browse({
+            other_id for other_ids in conflicts.values() for other_id in other_ids
+        })
+        names = {other.id: other.name for other in others}
+        self.browse(list(conflicts))._message_log_batch(bodies={
+            request_id: 'Technician double-booked with: ' + ', '.join(
+                names[other_id] for other_id in other_ids
+            )
+            for request_id, other_ids in conflicts.items()
+        })
+
+    @api.onchange('technician_id', 'scheduled_date', 'estimated_hours')
+    def _onchange_schedule_conflict(self):
+        """Warn while editing when the slot overlaps another booking."""
+        if not (self.technician_id and self.scheduled_date and self.planned_end_date):
+            return
+        overlapping = self.search([
+            ('id', '!=', self._origin.id or 0),
+            ('technician_id', '=', self.technician_id.id),
+            ('state', 'in', ['new', 'in_progress']),
+            ('scheduled_date', '<', self.planned_end_date),
+            ('planned_end_date', '>', self.scheduled_date),
+        ], limit=5)
+        if overlapping:
+            return {'warning': {
+                'title': 'Technician double-booked',
+                'message': f'{self.technician_id.name} is already booked for: '
+                           + ', '.join(overlapping.mapped('name')),
+            }}
+
+    @api.model
+    def _get_busy_intervals(self, user_ids, date_from, date_to):
+        """
+        Return ``{user_id: [(start, end), ...]}`` with the merged open
+        bookings of ``user_ids`` intersecting [date_from, date_to).
+        """
+        self.flush_model(['technician_id', 'scheduled_date', 'planned_end_date', 'state', 'active'])
+        self.env.cr.execute("""
+            SELECT technician_id, scheduled_date, planned_end_date
+              FROM maintenance_request
+             WHERE technician_id = ANY(%s)
+               AND scheduled_date IS NOT NULL
+               AND state IN ('new', 'in_progress')
+               AND active
+               AND tsrange(scheduled_date, planned_end_date) && tsrange(%s, %s)
+          ORDER BY technician_id, scheduled_date
+        """, [list(user_ids), date_from, date_to])
+        busy = defaultdict(list)
+        for user_id, start, end in self.env.cr.fetchall():
+            intervals = busy[user_id]
+            if intervals and start <= intervals[-1][1]:
+                intervals[-1] = (intervals[-1][0], max(intervals[-1][1], end))
+            else:
+                intervals.append((start, end))
+        return busy
+
+    @api.model
+    def _get_free_intervals(self, user_ids, date_from, date_to, day_start=8, day_end=17):
+        """
+        Return ``{user_id: [(start, end), ...]}`` of free working time,
+        working hours being ``day_start``-``day_end`` (UTC) every day.
+        """
+        busy = self._get_busy_intervals(user_ids, date_from, date_to)
+        windows = []
+        day = date_from.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day < date_to:
+            start = max(day + timedelta(hours=day_start), date_from)
+            end = min(day + timedelta(hours=day_end), date_to)
+            if start < end:
+                windows.append((start, end))
+            day += timedelta(days=1)
+
+        free = {}
+        for user_id in user_ids:
+            slots = []
+            bookings = busy.get(user_id, [])
+            index = 0
+            for start, end in windows:
+                cursor = start
+                # Bookings are sorted and merged: skip those ending before the window
+                while index < len(bookings) and bookings[index][1] <= cursor:
+                    index += 1
+                probe = index
+                while probe < len(bookings) and bookings[probe][0] < end:
+                    booked_start, booked_end = bookings[probe]
+                    if booked_start > cursor:
+                        slots.append((cursor, booked_start))
+                    cursor = max(cursor, booked_end)
+                    probe += 1
+                if cursor < end:
+                    slots.append((cursor, end))
+            free[user_id] = slots
+        return free
+
+    @api.model
+    def get_free_slots(self, date_from, date_to, technician_ids=None, team_id=None, min_hours=1.0):
+        """
+        Return the free slots of technicians over a date range.
+
+        :param date_from: range start (datetime or string, UTC)
+        :param date_to: range end (datetime or string, UTC)
+        :param technician_ids: technicians to check
+        :param team_id: or all members of this team
+        :param min_hours: drop slots shorter than this
+        :return: list of ``{'technician_id', 'start', 'end', 'hours'}``
+        """
+        date_from = fields.Datetime.to_datetime(date_from)
+        date_to = fields.Datetime.to_datetime(date_to)
+        user_ids = list(technician_ids or [])
+        if team_id:
+            user_ids += self.env['maintenance.team'].browse(team_id).member_ids.ids
+        slots = []
+        for user_id, intervals in self._get_free_intervals(set(user_ids), date_from, date_to).items():
+            for start, end in intervals:
+                hours = (end - start).total_seconds() / 3600.0
+                if hours >= min_hours:
+                    slots.append({
+                        'technician_id': user_id,
+                        'start': fields.Datetime.to_string(start),
+                        'end': fields.Datetime.to_string(end),
+                        'hours': hours,
+                    })
+        return sorted(slots, key=lambda slot: (slot['start'], slot['technician_id']))
+
+    @api.model
+    def _get_unscheduled_preventive_domain(self, team_ids=None):
+        """Domain of the preventive requests waiting to be planned."""
+        domain = [
+            ('request_type', '=', 'preventive'),
+            ('state', '=', 'new'),
+            ('scheduled_date', '=', False),
+        ]
+        if team_ids:
+            domain += ['|', ('team_id', 'in', team_ids), ('equipment_id.team_id', 'in', team_ids)]
+        return domain
+
+    @api.model
+    def _schedule_preventive_requests(self, date_from, date_to, requests=None,
+                                      day_start=8, day_end=17):
+        """
+        Place unscheduled preventive requests into technicians' free working
+        time between ``date_from`` and ``date_to``.
+
+        Requests are taken by priority then age; each goes to its assigned
+        technician or, when unassigned, to the member of its team (or its
+        equipment's team) free the earliest, using CapacityPlanner. The
+        resulting plan is written with a single UPDATE.
+
+        :param requests: requests to plan (default: all new, unscheduled
+            preventive requests)
+        :return: list of ``(request_id, technician_id, start, end)``; the
+            requests left out found no room in the horizon
+        """
+        if requests is None:
+            requests = self.search(self._get_unscheduled_preventive_domain())
+        requests = requests.filtered(lambda r: r.state == 'new' and not r.scheduled_date)
+        if not requests:
+            return []
+
+        teams = requests.team_id | requests.equipment_id.team_id
+        members_by_team = {team.id: team.member_ids.ids for team in teams}
+        user_ids = set(teams.member_ids.ids) | set(requests.technician_id.ids)
+        free = self._get_free_intervals(user_ids, date_from, date_to, day_start, day_end)
+        planner = CapacityPlanner(free, members_by_team)
+
+        plan = []
+        for request in requests.sorted(lambda r: (-int(r.priority or 0), r.request_date or date_from, r.id)):
+            placed = planner.place(
+                request.estimated_hours or 1.0,
+                team_id=(request.team_id or request.equipment_id.team_id).id,
+                user_id=request.technician_id.id,
+            )
+            if placed:
+                plan.append((request.id, *placed))
+        self._write_schedule(plan)
+        return plan
+
+    @api.model
+    def _write_schedule(self, plan):
+        """
+        Write ``[(request_id, technician_id, start, end)]`` in one UPDATE,
+        then do what ``write()`` would: recompute dependent fields, publish
+        the dashboard deltas, flag double-bookings and log the booking on
+        each request.
+        """
+        if not plan:
+            return
+        self.flush_model()
+        request_ids, technician_ids, starts, _ends = (list(column) for column in zip(*plan))
+        requests = self.browse(request_ids)
+        dashboard_before = requests._dashboard_counters_by_target()
+        self.env.cr.execute("""
+            UPDATE maintenance_request r
+               SET technician_id = p.technician_id,
+                   scheduled_date = p.start_date,
+                   overdue_notified_date = NULL,
+                   write_uid = %s,
+                   write_date = NOW() AT TIME ZONE 'UTC'
+              FROM unnest(%s::int[], %s::int[], %s::timestamp[])
+                   AS p(id, technician_id, start_date)
+             WHERE r.id = p.id
+        """, [self.env.uid, request_ids, technician_ids, starts])
+        requests.invalidate_recordset([
+            'technician_id', 'scheduled_date', 'overdue_notified_date', 'write_uid', 'write_date',
+        ])
+        requests.modified(['technician_id', 'scheduled_date'])
+        requests.flush_recordset()
+
+        requests._notify_dashboard(dashboard_deltas(dashboard_before, requests._dashboard_counters_by_target()))
+        requests._log_schedule_conflicts()
+        technicians = {user.id: user.name for user in self.env['res.users'].browse(set(technician_ids))}
+        requests._message_log_batch(bodies={
+            request_id: f'Planned by the preventive scheduler: {technicians[technician_id]}, '
+                        f'{fields.Datetime.to_string(start)} (UTC)'
+            for request_id, technician_id, start in zip(request_ids, technician_ids, starts)
+        })
+
+    @api.model
+    def _cron_schedule_preventive_requests(self, horizon_days=None):
+        """
+        Cron job: Plan unscheduled preventive requests over the next
+        ``gearguard.preventive_planning_days`` days (default 14) from tomorrow.
+        """
+        if horizon_days is None:
+            horizon_days = int(self.env['ir.config_parameter'].sudo().get_param(
+                'gearguard.preventive_planning_days', 14))
+        date_from = fields.Datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        self._schedule_preventive_requests(date_from, date_from + timedelta(days=horizon_days))
+        return True
+
+    # ---------------------------
+    # Lean Kanban Data
+    # ---------------------------
+    @api.model
+    def _color_sql(self, now):
+        """SQL equivalent of ``_compute_color`` for rows aliased ``r``."""
+        return SQL("""
+            CASE WHEN r.state IN ('new', 'in_progress') AND r.scheduled_date < %s THEN 1
+                 WHEN r.state = 'scrap' THEN 9
+                 WHEN r.priority = '3' THEN 2
+                 WHEN r.priority = '2' THEN 3
+                 WHEN r.state = 'repaired' THEN 10
+                 ELSE 0
+            END
+        """, now)
+
+    @api.model
+    def get_kanban_data(self, domain=None, limit_per_column=40):
+        """
+        Return the kanban board in one query, without loading ORM records.
+
+        Each column holds at most ``limit_per_column`` cards in ``_order``,
+        cut with ROW_NUMBER() over the kanban order index, plus the total
+        count of the column. Only the card fields are read; ``color`` and
+        ``is_overdue`` are derived in SQL. Access rules apply through
+        ``_search``.
+
+        :param domain: optional domain filtering the requests
+        :param limit_per_column: maximum number of cards per state column
+        :return: list of columns ``{'state', 'count', 'records'}`` in
+            workflow order, empty columns included
+        """
+        self.flush_model()
+        now = fields.Datetime.now()
+        query = self._search(domain or [])
+        self.env.cr.execute(SQL("""
+            SELECT *
+              FROM (
+                SELECT r.id,
+                       r.name,
+                       r.state,
+                       r.priority,
+                       r.kanban_state,
+                       r.request_type,
+                       r.scheduled_date,
+                       r.equipment_id,
+                       e.name AS equipment_name,
+                       c.name AS category_name,
+                       r.technician_id,
+                       p.name AS technician_name,
+                       r.state IN ('new', 'in_progress') AND r.scheduled_date < %s AS is_overdue,
+                       %s AS color,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY r.state
+                           ORDER BY r.priority DESC, r.scheduled_date ASC, r.id DESC
+                       ) AS position,
+                       COUNT(*) OVER (PARTITION BY r.state) AS column_count
+                  FROM maintenance_request r
+                  JOIN maintenance_equipment e ON e.id = r.equipment_id
+             LEFT JOIN equipment_category c ON c.id = r.category_id
+             LEFT JOIN res_users u ON u.id = r.technician_id
+             LEFT JOIN res_partner p ON p.id = u.partner_id
+                 WHERE r.id IN (%s)
+              ) cards
+             WHERE position <= %s
+          ORDER BY state, position
+        """, now, self._color_sql(now), query.subselect(), limit_per_column))
+
+        columns = {
+            state: {'state': state, 'count': 0, 'records': []}
+            for state in self._expand_states(None, None, None)
+        }
+        for row in self.env.cr.dictfetchall():
+            column = columns[row['state']]
+            column['count'] = row['column_count']
+            column['records'].append({
+                'id': row['id'],
+                'name': row['name'],
+                'priority': row['priority'],
+                'kanban_state': row['kanban_state'],
+                'request_type': row['request_type'],
+                'scheduled_date': fields.Datetime.to_string(row['scheduled_date']),
+                'equipment_id': (row['equipment_id'], row['equipment_name']),
+                'category': row['category_name'] or '',
+                'technician_id': row['technician_id'] and (row['technician_id'], row['technician_name']),
+                'is_overdue': bool(row['is_overdue']),
+                'color': row['color'],
+            })
+        return list(columns.values())
+
     # ---------------------------
     # Onchange Methods (Auto-fill)
     # ---------------------------
@@ -305,7 +895,11 @@ class MaintenanceRequest(models.Model):
         if self.equipment_id:
             self.category_id = self.equipment_id.category_id
             self.team_id = self.equipment_id.team_id
-            self.technician_id = self.equipment_id.technician_id
+            # Least-loaded team member; the equipment's default technician
+            # only when the team has nobody to balance across
+            self.technician_id = (
+                self.team_id and self.team_id._suggest_technician(self.estimated_hours)
+            ) or self.equipment_id.technician_id
         else:
             self.category_id = False
             self.team_id = False
@@ -320,45 +914,220 @@ class MaintenanceRequest(models.Model):
         else:
             self.technician_id = False
 
+    # ---------------------------
+    # Dashboard
+    # ---------------------------
+    @api.model
+    def get_dashboard_statistics(self):
+        """
+        Return all dashboard KPIs with one aggregate query per model.
+
+        Counts cover active records visible to the user (access rules apply
+        through ``_search``), like the dashboard's former per-KPI
+        ``search_count`` calls; a request is repaired this month when its
+        end date falls in the current month.
+
+        :return: dict keyed like the dashboard state (totalEquipment,
+            activeEquipment, scrappedEquipment, totalRequests, newRequests,
+            inProgressRequests, overdueRequests, repairedThisMonth)
+        """
+        Equipment = self.env['maintenance.equipment']
+        Equipment.flush_model(['is_scrap', 'active'])
+        self.flush_model(['state', 'scheduled_date', 'end_date', 'active'])
+        cr = self.env.cr
+
+        query = Equipment._search([])
+        is_scrap = SQL.identifier(query.table, 'is_scrap')
+        cr.execute(query.select(
+            SQL("COUNT(*)"),
+            SQL("COUNT(*) FILTER (WHERE %s IS NOT TRUE)", is_scrap),
+            SQL("COUNT(*) FILTER (WHERE %s)", is_scrap),
+        ))
+        total_equipment, active_equipment, scrapped_equipment = cr.fetchone()
+
+        now = fields.Datetime.now()
+        query = self._search([])
+        state = SQL.identifier(query.table, 'state')
+        cr.execute(query.select(
+            SQL("COUNT(*)"),
+            SQL("COUNT(*) FILTER (WHERE %s = 'new')", state),
+            SQL("COUNT(*) FILTER (WHERE %s = 'in_progress')", state),
+            SQL("COUNT(*) FILTER (WHERE %s IN ('new', 'in_progress') AND %s < %s)",
+                state, SQL.identifier(query.table, 'scheduled_date'), now),
+            SQL("COUNT(*) FILTER (WHERE %s = 'repaired' AND %s >= %s)",
+                state, SQL.identifier(query.table, 'end_date'), self._dashboard_month_start()),
+        ))
+        total, new, in_progress, overdue, repaired_this_month = cr.fetchone()
+        return {
+            'totalEquipment': total_equipment,
+            'activeEquipment': active_equipment,
+            'scrappedEquipment': scrapped_equipment,
+            'totalRequests': total,
+            'newRequests': new,
+            'inProgressRequests': in_progress,
+            'overdueRequests': overdue,
+            'repairedThisMonth': repaired_this_month,
+        }
+
+    @api.model
+    def _dashboard_month_start(self):
+        """First instant of the current month, bounding "repaired this month"."""
+        return fields.Datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    def _dashboard_counters_by_target(self):
+        """
+        Managers count every request; other users only the requests they can
+        read under ``rule_request_team_edit`` (theirs or their team's).
+        """
+        managers = self.env.ref('gearguard.group_gearguard_manager')
+        by_target = defaultdict(Counter)
+        by_target[('res.groups', managers.id)] = self._dashboard_counters()
+        manager_users = managers.sudo().users
+        # Requests with the same technician and team have the same viewers
+        for (technician, team), requests in self.sudo().grouped(
+            lambda request: (request.technician_id, request.team_id)
+        ).items():
+            viewers = (technician | team.member_ids) - manager_users
+            if not viewers:
+                continue
+            counters = requests._dashboard_counters()
+            for partner in viewers.partner_id:
+                by_target[('res.partner', partner.id)].update(counters)
+        return by_target
+
+    def _dashboard_counters(self):
+        """Count the active requests towards the dashboard request KPIs."""
+        month_start = self._dashboard_month_start()
+        counters = Counter()
+        for request in self.filtered('active'):
+            counters['totalRequests'] += 1
+            if request.state == 'new':
+                counters['newRequests'] += 1
+            elif request.state == 'in_progress':
+                counters['inProgressRequests'] += 1
+            elif request.state == 'repaired' and request.end_date and request.end_date >= month_start:
+                counters['repairedThisMonth'] += 1
+            if request.is_overdue:
+                counters['overdueRequests'] += 1
+        return counters
+
     # ---------------------------
     # CRUD Overrides
     # ---------------------------
     @api.model_create_multi
     def create(self, vals_list):
         """Set default values on create."""
+        self = self._with_bulk_mode()
         for vals in vals_list:
             # Ensure request date is set
             if 'request_date' not in vals:
                 vals['request_date'] = datetime.now()
-        return super().create(vals_list)
+        self._assign_technicians(vals_list)
+        self.env['maintenance.team']._invalidate_request_count_cache()
+        requests = super().create(vals_list)
+        requests.filtered('technician_id')._log_schedule_conflicts()
+        return requests
+
+    @api.model
+    def _assign_technicians(self, vals_list):
+        """
+        Give each new request without a technician (missing or empty) the
+        least-loaded member of its team (explicit team or the equipment's
+        team), like the equipment onchange; the equipment's default
+        technician only when the team has nobody to balance across.
+
+        One workload query serves the whole batch; assignments made earlier
+        in the batch count towards later picks. Skipped with the context key
+        ``gearguard_defer_assignment``, for requests the preventive planner
+        assigns when it books them.
+        """
+        if self.env.context.get('gearguard_defer_assignment'):
+            return
+        pending = [vals for vals in vals_list if not vals.get('technician_id')]
+        if not pending:
+            return
+        Equipment = self.env['maintenance.equipment']
+        equipment_by_id = {
+            equipment.id: equipment
+            for equipment in Equipment.browse(
+                {vals['equipment_id'] for vals in pending if vals.get('equipment_id')}
+            )
+        }
+        team_by_vals = [
+            (vals, vals.get('team_id') or equipment_by_id.get(vals.get('equipment_id'), Equipment).team_id.id)
+            for vals in pending
+        ]
+        teams = self.env['maintenance.team'].browse({team_id for _vals, team_id in team_by_vals if team_id})
+        balancer = teams._get_workload_balancer() if teams.member_ids else None
+        default_hours = self._fields['estimated_hours'].default(self)
+        for vals, team_id in team_by_vals:
+            user_id = False
+            if team_id and balancer:
+                user_id = balancer.assign(team_id, vals.get('estimated_hours', default_hours))
+            if not user_id:
+                user_id = equipment_by_id.get(vals.get('equipment_id'), Equipment).technician_id.id
+            if user_id:
+                vals['technician_id'] = user_id
 
     def write(self, vals):
         """Handle state transitions and related logic."""
-        # If moving to 'in_progress', set start date
-        if vals.get('state') == 'in_progress':
-            if not self.start_date:
-                vals['start_date'] = datetime.now()
+        self = self._with_bulk_mode()
+        # If moving to 'in_progress', set start date on records without one
+        not_started = self.browse()
+        if vals.get('state') == 'in_progress' and 'start_date' not in vals:
+            not_started = self.filtered(lambda r: not r.start_date)
         
-        # If moving to 'repaired', set end date and calculate duration
+        # If moving to 'repaired', set end date; duration is computed per
+        # record from its own start date once the write is done
+        compute_duration = False
         if vals.get('state') == 'repaired':
             vals['end_date'] = datetime.now()
-            for record in self:
-                if record.start_date and not vals.get('duration'):
-                    delta = datetime.now() - record.start_date
-                    vals['duration'] = delta.total_seconds() / 3600  # Convert to hours
+            compute_duration = not vals.get('duration')
         
-        # If moving to 'scrap', mark equipment as scrapped
+        # If moving to 'scrap', mark equipment as scrapped (once per equipment)
         if vals.get('state') == 'scrap':
+            request_names = defaultdict(list)
             for record in self:
-                record.equipment_id.write({
-                    'is_scrap': True,
-                    'active': False,
-                })
-                record.equipment_id.message_post(
-                    body=f'Equipment marked as SCRAP from maintenance request: {record.name}'
-                )
-        
-        return super().write(vals)
+                request_names[record.equipment_id.id].append(record.name)
+            self.env['maintenance.equipment'].browse(list(request_names))._scrap_batch(bodies={
+                equipment_id: f'Equipment marked as SCRAP from maintenance request: {", ".join(names)}'
+                for equipment_id, names in request_names.items()
+            })
+
+        # A rescheduled request is warned again once the new date passes
+        if 'scheduled_date' in vals and 'overdue_notified_date' not in vals:
+            vals['overdue_notified_date'] = False
+
+        # Team open-request counters depend on state, team and archiving
+        if {'state', 'team_id', 'active'} & set(vals):
+            self.env['maintenance.team']._invalidate_request_count_cache()
+
+        result = super().write(vals)
+        if not_started:
+            super(MaintenanceRequest, not_started).write({'start_date': datetime.now()})
+        if compute_duration:
+            self._compute_duration_from_dates()
+        if {'technician_id', 'scheduled_date', 'estimated_hours'} & set(vals):
+            self._log_schedule_conflicts()
+        return result
+
+    def _compute_duration_from_dates(self):
+        """
+        Set ``duration`` (hours) from ``start_date``/``end_date``, so each
+        request gets its own elapsed time.
+
+        Records are grouped by their duration and written with one
+        ``write()`` per group, which keeps tracking, write_uid/write_date
+        and the dependent computes while a batch completed together (the
+        usual case) still costs a single UPDATE.
+        """
+        records_by_hours = defaultdict(list)
+        for record in self:
+            if record.start_date and record.end_date:
+                hours = max((record.end_date - record.start_date).total_seconds() / 3600.0, 0.0)
+                records_by_hours[round(hours, 4)].append(record.id)
+        for hours, record_ids in records_by_hours.items():
+            self.browse(record_ids).write({'duration': hours})
 
     def unlink(self):
         """Prevent deletion of requests that are in progress or completed."""
@@ -368,48 +1137,70 @@ class MaintenanceRequest(models.Model):
                     'Cannot delete a request that is In Progress or Repaired. '
                     'Please archive it instead.'
                 )
+        self.env['maintenance.team']._invalidate_request_count_cache()
         return super().unlink()
 
     # ---------------------------
     # Workflow Actions
     # ---------------------------
+    def _apply_transition(self, target_state, source_states=None, vals=None,
+                          message=None, error=None):
+        """
+        Move every request in ``self`` to ``target_state`` in one pass.
+
+        All source states are validated up front, the records are updated
+        with a single ``write()`` and the chatter notes are logged with one
+        batched insert instead of one ``message_post()`` per record.
+
+        :param target_state: state to move the records to
+        :param source_states: allowed current states (``None`` allows any)
+        :param vals: extra values written together with the state
+        :param message: chatter note logged on every record
+        :param error: message of the UserError raised on invalid sources
+        """
+        if source_states is not None:
+            invalid = self.filtered(lambda r: r.state not in source_states)
+            if invalid:
+                raise UserError(error or 'Invalid state transition.')
+        if not self:
+            return True
+        self.write(dict(vals or {}, state=target_state))
+        if message:
+            self._message_log_batch(bodies={record_id: message for record_id in self.ids})
+        return True
+
     def action_start(self):
         """Move request to 'In Progress' state."""
-        for record in self:
-            if record.state != 'new':
-                raise UserError('Only new requests can be started.')
-            record.write({
-                'state': 'in_progress',
-                'start_date': datetime.now(),
-            })
-            record.message_post(body='Maintenance work started.')
+        return self._apply_transition(
+            'in_progress', source_states=['new'],
+            vals={'start_date': datetime.now()},
+            message='Maintenance work started.',
+            error='Only new requests can be started.',
+        )
 
     def action_complete(self):
         """Move request to 'Repaired' state."""
-        for record in self:
-            if record.state != 'in_progress':
-                raise UserError('Only in-progress requests can be completed.')
-            record.write({'state': 'repaired'})
-            record.message_post(body='Maintenance work completed.')
+        return self._apply_transition(
+            'repaired', source_states=['in_progress'],
+            message='Maintenance work completed.',
+            error='Only in-progress requests can be completed.',
+        )
 
     def action_scrap(self):
         """Move request to 'Scrap' state and mark equipment as scrapped."""
-        for record in self:
-            record.write({'state': 'scrap'})
-            record.message_post(body='Equipment marked as SCRAP.')
+        return self._apply_transition(
+            'scrap',
+            message='Equipment marked as SCRAP.',
+        )
 
     def action_reset_to_new(self):
         """Reset request back to 'New' state."""
-        for record in self:
-            if record.state == 'scrap':
-                raise UserError('Cannot reset a scrapped request.')
-            record.write({
-                'state': 'new',
-                'start_date': False,
-                'end_date': False,
-                'duration': 0,
-            })
-            record.message_post(body='Request reset to New.')
+        return self._apply_transition(
+            'new', source_states=['new', 'in_progress', 'repaired'],
+            vals={'start_date': False, 'end_date': False, 'duration': 0},
+            message='Request reset to New.',
+            error='Cannot reset a scrapped request.',
+        )
 
     def action_assign_to_me(self):
         """Assign current user as technician."""
@@ -423,20 +1214,38 @@ class MaintenanceRequest(models.Model):
     # Scheduled Actions (Cron Jobs)
     # ---------------------------
     @api.model
-    def _cron_check_overdue_requests(self):
+    def _cron_check_overdue_requests(self, batch_size=1000):
         """
         Cron job: Check for overdue maintenance requests.
-        Runs daily to update overdue status and log warnings.
+        Runs daily and logs a warning once on each overdue request.
+
+        Notified requests are marked with ``overdue_notified_date``, which is
+        cleared when the request is rescheduled, so requests created or moved
+        to a past date are warned about too. Requests are processed in chunks
+        of ``batch_size``; each chunk is logged with one batched insert and
+        committed together with its markers, so an interrupted run resumes
+        where it stopped instead of notifying the same requests again.
         """
-        overdue_requests = self.search([
-            ('state', 'not in', ['repaired', 'scrap']),
-            ('scheduled_date', '<', fields.Datetime.now()),
-        ])
-        for request in overdue_requests:
-            request.message_post(
-                body='⚠️ This maintenance request is OVERDUE!',
-                message_type='notification',
-            )
+        now = fields.Datetime.now()
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+
+        while True:
+            requests = self.search([
+                ('state', 'in', ['new', 'in_progress']),
+                ('scheduled_date', '<', now),
+                ('overdue_notified_date', '=', False),
+            ], order='scheduled_date, id', limit=batch_size)
+            if not requests:
+                break
+            requests._message_log_batch(bodies={
+                request_id: '⚠️ This maintenance request is OVERDUE!'
+                for request_id in requests.ids
+            })
+            requests.write({'overdue_notified_date': now})
+            if auto_commit:
+                self.env.cr.commit()
+            if len(requests) < batch_size:
+                break
         return True
 
     @api.model
@@ -444,31 +1253,65 @@ class MaintenanceRequest(models.Model):
         """
         Cron job: Send email reminders for overdue requests.
         Sends notification to assigned technician or team leader.
+
+        By default one digest per recipient is queued, listing all of their
+        overdue requests. Set ``gearguard.overdue_reminder_digest`` to False
+        to queue one email per request instead. Emails are never sent
+        synchronously: the mail queue flushes them over a shared SMTP
+        connection.
         """
-        template = self.env.ref('gearguard.email_template_request_overdue', raise_if_not_found=False)
-        if not template:
-            return True
-        
         overdue_requests = self.search([
-            ('state', 'not in', ['repaired', 'scrap']),
+            ('state', 'in', ['new', 'in_progress']),
             ('scheduled_date', '<', fields.Datetime.now()),
+            '|', ('technician_id', '!=', False), ('team_id', '!=', False),
         ])
-        for request in overdue_requests:
-            if request.technician_id or request.team_id:
-                template.send_mail(request.id, force_send=True)
+        if not overdue_requests:
+            return True
+
+        digest = self.env['ir.config_parameter'].sudo().get_param(
+            'gearguard.overdue_reminder_digest', 'True'
+        )
+        if digest.lower() in ('1', 'true', 'yes'):
+            overdue_requests._queue_overdue_digests()
+        else:
+            template = self.env.ref('gearguard.email_template_request_overdue', raise_if_not_found=False)
+            if template:
+                for request in overdue_requests:
+                    template.send_mail(request.id)
         return True
 
-    @api.model
-    def _cron_update_statistics(self):
+    def _get_overdue_reminder_recipient(self):
+        """Return the partner to remind: the technician, else the team leader."""
+        self.ensure_one()
+        user = self.technician_id or self.team_id.leader_id
+        return user.partner_id
+
+    def _queue_overdue_digests(self):
         """
-        Cron job: Update maintenance statistics.
-        Recomputes stored computed fields for reporting.
+        Queue one overdue digest email per recipient for the requests in
+        ``self``, created with a single ``mail.mail`` insert.
         """
-        # Trigger recomputation of is_overdue and days_overdue
-        all_requests = self.search([('state', 'not in', ['repaired', 'scrap'])])
-        all_requests._compute_is_overdue()
-        all_requests._compute_days_overdue()
-        return True
+        requests_by_partner = defaultdict(lambda: self.browse())
+        for request in self:
+            partner = request._get_overdue_reminder_recipient()
+            if partner.email:
+                requests_by_partner[partner] |= request
+
+        email_from = self.env.company.email_formatted or self.env.user.email_formatted
+        mail_values = []
+        for partner, requests in requests_by_partner.items():
+            body = self.env['ir.qweb']._render('gearguard.email_body_overdue_digest', {
+                'recipient': partner,
+                'requests': requests,
+            })
+            mail_values.append({
+                'subject': f'⚠️ OVERDUE: {len(requests)} maintenance request(s) need attention',
+                'body_html': body,
+                'email_from': email_from,
+                'recipient_ids': [(4, partner.id)],
+                'auto_delete': True,
+            })
+        return self.env['mail.mail'].sudo().create(mail_values)
 
     # ---------------------------
     # Email Notification Methods
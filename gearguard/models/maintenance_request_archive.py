@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+Maintenance Request Archive Model
+=================================
+Cold storage for closed maintenance requests.
+
+Repaired and scrapped requests closed more than N months ago (parameter
+``gearguard.request_archive_months``, default 24) are moved out of
+maintenance_request by a daily scheduled action, so kanban, calendar and
+the overdue crons keep scanning a small hot table as history accumulates.
+
+Archived rows keep their original id: chatter, attachments and activities
+(linked by res_id) are picked up again when a request is restored.
+
+Database Table: maintenance_request_archive
+-------------------------------------------
+Range-partitioned by ``end_date`` with one partition per year, created on
+demand, plus a default partition for requests closed without an end date.
+Reporting reads hot and archived rows together through
+``_request_union_query``.
+"""
+import threading
+
+from odoo import models, fields, api
+from odoo.exceptions import AccessError, UserError
+
+
+# Columns copied between maintenance_request and the archive, with their
+# archive column types
+ARCHIVE_COLUMNS = {
+    'id': 'integer NOT NULL',
+    'name': 'varchar NOT NULL',
+    'description': 'text',
+    'active': 'boolean',
+    'request_type': 'varchar',
+    'priority': 'varchar',
+    'state': 'varchar',
+    'kanban_state': 'varchar',
+    'equipment_id': 'integer',
+    'category_id': 'integer',
+    'team_id': 'integer',
+    'technician_id': 'integer',
+    'user_id': 'integer',
+    'request_date': 'timestamp',
+    'scheduled_date': 'timestamp',
+    'start_date': 'timestamp',
+    'end_date': 'timestamp',
+    'duration': 'double precision',
+    'estimated_hours': 'double precision',
+    'create_uid': 'integer',
+    'create_date': 'timestamp',
+    'write_uid': 'integer',
+    'write_date': 'timestamp',
+}
+
+# Archived columns referencing other tables, checked before a restore: the
+# archive has no foreign keys, so the targets may be gone by then
+ARCHIVE_REFERENCES = {
+    'equipment_id': 'maintenance_equipment',
+    'category_id': 'equipment_category',
+    'team_id': 'maintenance_team',
+    'technician_id': 'res_users',
+    'user_id': 'res_users',
+    'create_uid': 'res_users',
+    'write_uid': 'res_users',
+}
+
+
+class MaintenanceRequestArchive(models.Model):
+    _name = 'maintenance.request.archive'
+    _description = 'Archived Maintenance Request'
+    _auto = False
+    _order = 'end_date desc, id desc'
+
+    # ---------------------------
+    # Archived Request Data
+    # ---------------------------
+    name = fields.Char(string='Subject', readonly=True)
+    description = fields.Html(string='Description', readonly=True)
+    active = fields.Boolean(string='Active', readonly=True)
+    request_type = fields.Selection(
+        selection=[
+            ('corrective', 'Corrective (Breakdown)'),
+            ('preventive', 'Preventive (Routine)')
+        ],
+        string='Maintenance Type',
+        readonly=True
+    )
+    priority = fields.Selection(
+        selection=[
+            ('0', 'Low'),
+            ('1', 'Normal'),
+            ('2', 'High'),
+            ('3', 'Urgent')
+        ],
+        string='Priority',
+        readonly=True
+    )
+    state = fields.Selection(
+        selection=[
+            ('new', 'New'),
+            ('in_progress', 'In Progress'),
+            ('repaired', 'Repaired'),
+            ('scrap', 'Scrap')
+        ],
+        string='Stage',
+        readonly=True
+    )
+    kanban_state = fields.Selection(
+        selection=[
+            ('normal', 'In Progress'),
+            ('blocked', 'Blocked'),
+            ('done', 'Ready')
+        ],
+        string='Kanban State',
+        readonly=True
+    )
+    equipment_id = fields.Many2one('maintenance.equipment', string='Equipment', readonly=True)
+    category_id = fields.Many2one('equipment.category', string='Equipment Category', readonly=True)
+    team_id = fields.Many2one('maintenance.team', string='Maintenance Team', readonly=True)
+    technician_id = fields.Many2one('res.users', string='Assigned Technician', readonly=True)
+    user_id = fields.Many2one('res.users', string='Created By', readonly=True)
+    request_date = fields.Datetime(string='Request Date', readonly=True)
+    scheduled_date = fields.Datetime(string='Scheduled Date', readonly=True)
+    start_date = fields.Datetime(string='Start Date', readonly=True)
+    end_date = fields.Datetime(string='End Date', readonly=True)
+    duration = fields.Float(string='Duration (Hours)', readonly=True)
+    estimated_hours = fields.Float(string='Estimated Hours', readonly=True)
+    archive_date = fields.Datetime(string='Archived On', readonly=True)
+
+    # ---------------------------
+    # Table Management
+    # ---------------------------
+    def init(self):
+        self._create_archive_table()
+
+    @api.model
+    def _create_archive_table(self):
+        """Create the partitioned archive table and its indexes if missing."""
+        cr = self.env.cr
+        columns = ', '.join(f'{name} {column_type}' for name, column_type in ARCHIVE_COLUMNS.items())
+        cr.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self._table} (
+                {columns},
+                archive_date timestamp
+            ) PARTITION BY RANGE (end_date)
+        """)
+        # Columns added to maintenance_request after the table was created
+        for name, column_type in ARCHIVE_COLUMNS.items():
+            cr.execute(f"""
+                ALTER TABLE {self._table}
+                ADD COLUMN IF NOT EXISTS {name} {column_type.replace(' NOT NULL', '')}
+            """)
+        cr.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self._table}_default
+            PARTITION OF {self._table} DEFAULT
+        """)
+        cr.execute(f"CREATE INDEX IF NOT EXISTS {self._table}_id_idx ON {self._table} (id)")
+        cr.execute(f"""
+            CREATE INDEX IF NOT EXISTS {self._table}_equipment_id_idx
+            ON {self._table} (equipment_id)
+        """)
+
+    @api.model
+    def _ensure_partitions(self, years):
+        """Create the yearly partitions for ``years`` that do not exist yet."""
+        for year in sorted(years):
+            self.env.cr.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self._table}_y{year:d}
+                PARTITION OF {self._table}
+                FOR VALUES FROM ('{year:d}-01-01') TO ('{year + 1:d}-01-01')
+            """)
+
+    @api.model
+    def _request_union_query(self):
+        """
+        SQL selecting the archived columns from hot and archived requests
+        together, for reports that must see the full history. Adds an
+        ``is_archived`` column.
+        """
+        columns = ', '.join(ARCHIVE_COLUMNS)
+        return f"""
+            SELECT {columns}, FALSE AS is_archived FROM maintenance_request
+             UNION ALL
+            SELECT {columns}, TRUE AS is_archived FROM {self._table}
+        """
+
+    # ---------------------------
+    # Archiving
+    # ---------------------------
+    @api.model
+    def _cron_archive_closed_requests(self, months=None, batch_size=10000):
+        """
+        Cron job: Move requests closed more than ``months`` months ago into
+        the archive, ``batch_size`` rows per statement (one DELETE ...
+        RETURNING feeding one INSERT). Their pending activities are deleted
+        first.
+        """
+        if months is None:
+            months = int(self.env['ir.config_parameter'].sudo().get_param(
+                'gearguard.request_archive_months', 24))
+        if months <= 0:
+            return True
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        self.env['maintenance.request'].flush_model()
+        cr = self.env.cr
+        closed = """
+            state IN ('repaired', 'scrap')
+            AND COALESCE(end_date, write_date) < (NOW() AT TIME ZONE 'UTC') - %s * INTERVAL '1 month'
+        """
+        cr.execute(f"""
+            SELECT DISTINCT EXTRACT(YEAR FROM end_date)::int
+              FROM maintenance_request
+             WHERE end_date IS NOT NULL AND {closed}
+        """, [months])
+        self._ensure_partitions(row[0] for row in cr.fetchall())
+
+        columns = ', '.join(ARCHIVE_COLUMNS)
+        Activity = self.env['mail.activity'].sudo()
+        while True:
+            cr.execute(f"""
+                SELECT id FROM maintenance_request
+                 WHERE {closed}
+                 ORDER BY id
+                 LIMIT %s
+            """, [months, batch_size])
+            request_ids = [row[0] for row in cr.fetchall()]
+            if not request_ids:
+                break
+            # Pending activities would point at a request that is gone;
+            # messages and followers are kept for action_restore
+            Activity.search([
+                ('res_model', '=', 'maintenance.request'),
+                ('res_id', 'in', request_ids),
+            ]).unlink()
+            Activity.flush_model()
+            cr.execute(f"""
+                WITH moved AS (
+                    DELETE FROM maintenance_request
+                     WHERE id = ANY(%s)
+                 RETURNING {columns}
+                )
+                INSERT INTO {self._table} ({columns}, archive_date)
+                SELECT {columns}, NOW() AT TIME ZONE 'UTC' FROM moved
+            """, [request_ids])
+            moved = cr.rowcount
+            if auto_commit:
+                cr.commit()
+            if moved < batch_size:
+                break
+
+        self.env['maintenance.request'].invalidate_model()
+        self.env['maintenance.team']._invalidate_request_count_cache()
+        return True
+
+    def action_restore(self):
+        """
+        Move the selected requests back into the active request table and
+        recompute their stored computed fields (not archived).
+        """
+        if not self.env.user.has_group('gearguard.group_gearguard_manager'):
+            raise AccessError('Only maintenance managers can restore archived requests.')
+        if not self:
+            return True
+        self._check_restorable()
+        columns = ', '.join(ARCHIVE_COLUMNS)
+        self.env.cr.execute(f"""
+            WITH moved AS (
+                DELETE FROM {self._table}
+                 WHERE id = ANY(%s)
+             RETURNING {columns}
+            )
+            INSERT INTO maintenance_request ({columns})
+            SELECT {columns} FROM moved
+        """, [self.ids])
+        restored = self.env['maintenance.request'].browse(self.ids)
+        self.invalidate_model()
+        restored.invalidate_model()
+        for field in restored._fields.values():
+            if field.compute and field.store:
+                self.env.add_to_compute(field, restored)
+        restored.flush_recordset()
+        self.env['maintenance.team']._invalidate_request_count_cache()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Restored Requests',
+            'res_model': 'maintenance.request',
+            'view_mode': 'tree,form',
+            'domain': [('id', 'in', restored.ids)],
+        }
+
+    def _check_restorable(self):
+        """Raise if records referenced by the archived requests were deleted."""
+        Request = self.env['maintenance.request']
+        missing = ', '.join(
+            f"""(a.{column} IS NOT NULL AND NOT EXISTS (
+                    SELECT 1 FROM {table} WHERE {table}.id = a.{column}
+                )) AS {column}"""
+            for column, table in ARCHIVE_REFERENCES.items()
+        )
+        self.env.cr.execute(f"""
+            SELECT a.name, {missing}
+              FROM {self._table} a
+             WHERE a.id = ANY(%s)
+        """, [self.ids])
+        problems = []
+        for name, *flags in self.env.cr.fetchall():
+            labels = [
+                Request._fields[column].string
+                for column, gone in zip(ARCHIVE_REFERENCES, flags) if gone
+            ]
+            if labels:
+                problems.append(f'{name}: {", ".join(labels)}')
+        if problems:
+            raise UserError(
+                'These archived requests reference deleted records and cannot be restored:\n'
+                + '\n'.join(problems)
+            )
@@ -18,8 +18,50 @@ Related Table: maintenance_team_member_rel (Many2many)
     - team_id: FK to maintenance_team
     - user_id: FK to res_users
 """
+import heapq
+import time
+from collections import defaultdict
+
 from odoo import models, fields, api
 
+# Open request counts per (database, user): {key: (timestamp, {team_id: count})}
+_REQUEST_COUNT_CACHE = {}
+_REQUEST_COUNT_TTL = 30  # seconds
+# postcommit data flag: this transaction changed requests, counts are stale
+_REQUEST_COUNT_STALE = 'gearguard.team_request_counts_stale'
+
+
+class WorkloadBalancer:
+    """
+    Least-loaded technician picker shared by a set of teams.
+
+    Keeps one ``(hours, count)`` workload per technician and, per team, a
+    min-heap over its members. A technician can belong to several teams, so
+    heap entries are refreshed lazily when they no longer match the shared
+    workload. Each assignment costs O(log n) in the team size.
+    """
+
+    def __init__(self, loads, members_by_team):
+        self.loads = dict(loads)
+        self._heaps = {}
+        for team_id, user_ids in members_by_team.items():
+            heap = [(*self.loads.setdefault(uid, (0.0, 0)), uid) for uid in user_ids]
+            heapq.heapify(heap)
+            self._heaps[team_id] = heap
+
+    def assign(self, team_id, hours):
+        """Add ``hours`` to the least-loaded member of ``team_id`` and return it."""
+        heap = self._heaps.get(team_id)
+        if not heap:
+            return False
+        while (heap[0][0], heap[0][1]) != self.loads[heap[0][2]]:
+            uid = heap[0][2]
+            heapq.heapreplace(heap, (*self.loads[uid], uid))
+        load_hours, count, uid = heap[0]
+        self.loads[uid] = (load_hours + hours, count + 1)
+        heapq.heapreplace(heap, (*self.loads[uid], uid))
+        return uid
+
 
 class MaintenanceTeam(models.Model):
     _name = 'maintenance.team'
@@ -98,12 +140,133 @@ class MaintenanceTeam(models.Model):
 
     def _compute_request_count(self):
         """Compute number of open requests assigned to this team."""
-        request_model = self.env['maintenance.request']
+        counts = self._get_open_request_counts()
+        for team in self:
+            team.request_count = counts.get(team._origin.id or team.id, 0)
+
+    @api.model
+    def _get_open_request_counts(self):
+        """
+        Return a ``{team_id: open_request_count}`` mapping for all teams.
+
+        Counts come from a single GROUP BY team_id query and are cached for
+        the current transaction and, across transactions, for a few seconds
+        in the process (see ``_invalidate_request_count_cache``). A
+        transaction that changed requests neither reads nor fills the
+        process cache, so uncommitted counts never leak to other threads.
+        """
+        cr_cache = self.env.cr.cache
+        if 'gearguard_team_request_counts' in cr_cache:
+            return cr_cache['gearguard_team_request_counts']
+
+        key = (self.env.cr.dbname, self.env.uid)
+        shared = not self.env.cr.postcommit.data.get(_REQUEST_COUNT_STALE)
+        cached = _REQUEST_COUNT_CACHE.get(key) if shared else None
+        if cached and time.monotonic() - cached[0] < _REQUEST_COUNT_TTL:
+            counts = cached[1]
+        else:
+            groups = self.env['maintenance.request']._read_group(
+                domain=[
+                    ('team_id', '!=', False),
+                    ('state', 'in', ['new', 'in_progress']),
+                ],
+                groupby=['team_id'],
+                aggregates=['__count'],
+            )
+            counts = {team.id: count for team, count in groups}
+            if shared:
+                _REQUEST_COUNT_CACHE[key] = (time.monotonic(), counts)
+        cr_cache['gearguard_team_request_counts'] = counts
+        return counts
+
+    @api.model
+    def _invalidate_request_count_cache(self):
+        """
+        Forget cached open request counts for this database.
+
+        The transaction's own counts are dropped at once; the process cache
+        is cleared after commit, so no other thread can keep counts from
+        before the change. Other worker processes are not notified: their
+        caches expire with the TTL (``_REQUEST_COUNT_TTL`` seconds).
+        """
+        self.env.cr.cache.pop('gearguard_team_request_counts', None)
+        postcommit = self.env.cr.postcommit
+        if postcommit.data.get(_REQUEST_COUNT_STALE):
+            return
+        postcommit.data[_REQUEST_COUNT_STALE] = True
+        dbname = self.env.cr.dbname
+
+        @postcommit.add
+        def clear_request_count_cache():
+            for key in [key for key in _REQUEST_COUNT_CACHE if key[0] == dbname]:
+                _REQUEST_COUNT_CACHE.pop(key, None)
+
+    # ---------------------------
+    # Workload Balancing
+    # ---------------------------
+    def _get_workload_balancer(self, exclude_request_ids=None):
+        """
+        Build a WorkloadBalancer for the members of ``self``.
+
+        Open workload (count and estimated hours of new/in-progress
+        requests) is read for all members with one grouped query.
+        ``exclude_request_ids`` leaves out requests about to be reassigned.
+        """
+        members_by_team = {team.id: team.member_ids.ids for team in self}
+        member_ids = {uid for user_ids in members_by_team.values() for uid in user_ids}
+        loads = {}
+        if member_ids:
+            domain = [
+                ('technician_id', 'in', list(member_ids)),
+                ('state', 'in', ['new', 'in_progress']),
+            ]
+            if exclude_request_ids:
+                domain.append(('id', 'not in', list(exclude_request_ids)))
+            groups = self.env['maintenance.request']._read_group(
+                domain,
+                groupby=['technician_id'],
+                aggregates=['estimated_hours:sum', '__count'],
+            )
+            loads = {user.id: (hours or 0.0, count) for user, hours, count in groups}
+        return WorkloadBalancer(loads, members_by_team)
+
+    def _suggest_technician(self, hours=1.0):
+        """Return the least-loaded member of the team (empty if no members)."""
+        self.ensure_one()
+        user_id = self._get_workload_balancer().assign(self.id, hours)
+        return self.env['res.users'].browse(user_id or [])
+
+    def action_rebalance_workload(self):
+        """
+        Redistribute the not-yet-started requests of each team across its
+        members.
+
+        Requests already in progress stay with their technician and count
+        as fixed load; the movable ones are dealt largest first to the
+        least-loaded member, then written with one write per technician.
+        """
+        Request = self.env['maintenance.request']
+        movable = Request.search([
+            ('team_id', 'in', self.ids),
+            ('state', '=', 'new'),
+        ])
+        balancer = self._get_workload_balancer(exclude_request_ids=movable.ids)
+        by_technician = defaultdict(list)
+        moved_by_team = defaultdict(int)
+        for request in movable.sorted(lambda r: (-r.estimated_hours, r.id)):
+            user_id = balancer.assign(request.team_id.id, request.estimated_hours or 0.0)
+            if user_id and user_id != request.technician_id.id:
+                by_technician[user_id].append(request.id)
+                moved_by_team[request.team_id.id] += 1
+        for user_id, request_ids in by_technician.items():
+            Request.browse(request_ids).write({'technician_id': user_id})
+
         for team in self:
-            team.request_count = request_model.search_count([
-                ('team_id', '=', team.id),
-                ('state', 'in', ['new', 'in_progress'])
-            ])
+            team.message_post(
+                body=f'Workload rebalanced: {moved_by_team[team.id]} request(s) reassigned.',
+                subtype_xmlid='mail.mt_note',
+            )
+        return True
 
     # ---------------------------
     # Actions
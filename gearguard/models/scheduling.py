@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Preventive Scheduling Engine
+============================
+Greedy capacity planner placing jobs into technicians' free working time.
+
+Each technician has a sorted list of free slots (from
+``maintenance.request._get_free_intervals``). Per team, a min-heap keyed by
+each member's earliest free time gives the next candidate; heap entries are
+refreshed lazily since a technician may belong to several teams. A job is
+placed at the start of the first free slot long enough to hold it and the
+slot shrinks accordingly; jobs are never split across slots.
+"""
+import heapq
+from datetime import timedelta
+
+
+class CapacityPlanner:
+    """Greedy earliest-slot planner over technicians' free time."""
+
+    def __init__(self, free_by_user, members_by_team):
+        self.free = {uid: [list(slot) for slot in slots] for uid, slots in free_by_user.items()}
+        self._heaps = {}
+        for team_id, user_ids in members_by_team.items():
+            heap = [(self._earliest(uid), uid) for uid in user_ids if uid in self.free]
+            heap = [entry for entry in heap if entry[0] is not None]
+            heapq.heapify(heap)
+            self._heaps[team_id] = heap
+
+    def _earliest(self, uid):
+        """Start of the first non-empty free slot of ``uid`` (None when full)."""
+        slots = self.free.get(uid)
+        while slots and slots[0][0] >= slots[0][1]:
+            slots.pop(0)
+        return slots[0][0] if slots else None
+
+    def _fit(self, uid, hours):
+        """Return ``(index, start)`` of the first slot of ``uid`` holding ``hours``."""
+        length = timedelta(hours=hours)
+        for index, (start, end) in enumerate(self.free.get(uid, ())):
+            if end - start >= length:
+                return index, start
+        return None
+
+    def _book(self, uid, index, hours):
+        slot = self.free[uid][index]
+        start = slot[0]
+        slot[0] = start + timedelta(hours=hours)
+        return start, slot[0]
+
+    def place(self, hours, team_id=None, user_id=None):
+        """
+        Book ``hours`` for ``user_id`` or, when not given, for the member of
+        ``team_id`` free the earliest.
+
+        :return: ``(user_id, start, end)`` or None when nobody has room
+        """
+        if user_id:
+            fit = self._fit(user_id, hours)
+            if not fit:
+                return None
+            return (user_id, *self._book(user_id, fit[0], hours))
+
+        heap = self._heaps.get(team_id)
+        tried = []
+        placed = None
+        while heap and not placed:
+            key, uid = heapq.heappop(heap)
+            current = self._earliest(uid)
+            if current is None:
+                continue
+            if current != key:
+                heapq.heappush(heap, (current, uid))
+                continue
+            tried.append(uid)
+            fit = self._fit(uid, hours)
+            if fit:
+                placed = (uid, *self._book(uid, fit[0], hours))
+        for uid in tried:
+            current = self._earliest(uid)
+            if current is not None:
+                heapq.heappush(heap, (current, uid))
+        return placed
@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+from . import maintenance_request_report
+from . import maintenance_reliability
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Maintenance Reliability Model
+=============================
+Monthly reliability statistics per equipment, used to compute MTTR (mean
+time to repair) and MTBF (mean time between failures) per equipment,
+category and team.
+
+The table is filled by one set-based INSERT ... SELECT using window
+functions over hot and archived maintenance requests and refreshed
+incrementally: only the equipment whose requests changed since the last
+run is recomputed. Category and team are those recorded on each request,
+so history stays with the team that handled it when equipment moves.
+
+Database Table: maintenance_reliability
+---------------------------------------
+One row per equipment, request category and team, and month of the
+request date:
+    - failure_count: Corrective requests raised in the month
+    - repair_count / repair_hours: Repaired requests and their repair time
+    - gap_count / gap_hours: Failures with a previous failure on the same
+      equipment, and the hours elapsed since that previous failure
+"""
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+
+# write_date is the writer's transaction start: a transaction that began
+# before a refresh but committed after it carries an older write_date, so
+# each incremental refresh re-scans this much time before the watermark
+RELIABILITY_WATERMARK_OVERLAP = timedelta(hours=1)
+
+
+class MaintenanceReliability(models.Model):
+    _name = 'maintenance.reliability'
+    _description = 'Equipment Reliability Statistics'
+    _order = 'month desc, equipment_id'
+
+    # ---------------------------
+    # Dimensions
+    # ---------------------------
+    equipment_id = fields.Many2one(
+        'maintenance.equipment', string='Equipment', readonly=True, index=True, ondelete='cascade'
+    )
+    category_id = fields.Many2one('equipment.category', string='Equipment Category', readonly=True)
+    team_id = fields.Many2one('maintenance.team', string='Maintenance Team', readonly=True)
+    month = fields.Date(string='Month', readonly=True, index=True)
+
+    # ---------------------------
+    # Measures
+    # ---------------------------
+    failure_count = fields.Integer(string='Failures', readonly=True)
+    repair_count = fields.Integer(string='Repairs', readonly=True)
+    repair_hours = fields.Float(string='Repair Hours', readonly=True)
+    gap_count = fields.Integer(string='Failure Intervals', readonly=True)
+    gap_hours = fields.Float(string='Hours Between Failures', readonly=True)
+    mttr = fields.Float(
+        string='MTTR (Hours)', compute='_compute_mttr_mtbf', help='Mean time to repair'
+    )
+    mtbf = fields.Float(
+        string='MTBF (Hours)', compute='_compute_mttr_mtbf', help='Mean time between failures'
+    )
+
+    # ---------------------------
+    # Computed Methods
+    # ---------------------------
+    @api.depends('repair_count', 'repair_hours', 'gap_count', 'gap_hours')
+    def _compute_mttr_mtbf(self):
+        """Derive the monthly MTTR/MTBF from the stored sums."""
+        for stat in self:
+            stat.mttr = stat.repair_hours / stat.repair_count if stat.repair_count else 0.0
+            stat.mtbf = stat.gap_hours / stat.gap_count if stat.gap_count else 0.0
+
+    # ---------------------------
+    # Metrics API
+    # ---------------------------
+    @api.model
+    def get_reliability_metrics(self, group_by='equipment', date_from=None, date_to=None):
+        """
+        Return MTTR/MTBF aggregated per equipment, category or team.
+
+        Runs a single aggregate over the statistics table, so fleet-wide
+        figures over years of history never scan maintenance_request.
+
+        :param group_by: 'equipment', 'category' or 'team'
+        :param date_from: optional start date (date or 'YYYY-MM-DD')
+        :param date_to: optional end date (date or 'YYYY-MM-DD')
+        :return: list of dicts with id, name, failures, repairs, mttr, mtbf
+        """
+        if group_by not in ('equipment', 'category', 'team'):
+            raise ValueError(f'Unsupported reliability grouping: {group_by}')
+        domain = []
+        if date_from:
+            domain.append(('month', '>=', fields.Date.to_date(date_from).replace(day=1)))
+        if date_to:
+            domain.append(('month', '<=', fields.Date.to_date(date_to)))
+
+        groups = self._read_group(
+            domain,
+            groupby=[f'{group_by}_id'],
+            aggregates=['failure_count:sum', 'repair_count:sum', 'repair_hours:sum',
+                        'gap_count:sum', 'gap_hours:sum'],
+        )
+        return [{
+            'id': record.id,
+            'name': record.display_name if record else 'Undefined',
+            'failures': failures,
+            'repairs': repairs,
+            'mttr': repair_hours / repairs if repairs else 0.0,
+            'mtbf': gap_hours / gaps if gaps else 0.0,
+        } for record, failures, repairs, repair_hours, gaps, gap_hours in groups]
+
+    # ---------------------------
+    # Refresh
+    # ---------------------------
+    @api.model
+    def _cron_refresh_reliability(self, full=False):
+        """
+        Cron job: Refresh reliability statistics.
+
+        Incremental by default, using the ``gearguard.reliability_watermark``
+        parameter; changes since the previous refresh are re-scanned with an
+        overlap of ``RELIABILITY_WATERMARK_OVERLAP`` to catch rows committed
+        by transactions that were still running at that time (recomputing
+        an equipment twice is harmless). ``full=True`` rebuilds the whole
+        table, which also drops the contribution of deleted requests.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        watermark = ICP.get_param('gearguard.reliability_watermark')
+        self.env['maintenance.request'].flush_model()
+        cr = self.env.cr
+        cr.execute("SELECT NOW() AT TIME ZONE 'UTC'")
+        started_at = cr.fetchone()[0]
+
+        if full or not watermark:
+            self._refresh_statistics()
+        else:
+            since = fields.Datetime.to_datetime(watermark) - RELIABILITY_WATERMARK_OVERLAP
+            cr.execute("""
+                SELECT DISTINCT equipment_id FROM maintenance_request
+                 WHERE write_date >= %s AND equipment_id IS NOT NULL
+            """, [since])
+            equipment_ids = [row[0] for row in cr.fetchall()]
+            if equipment_ids:
+                self._refresh_statistics(equipment_ids)
+
+        ICP.set_param('gearguard.reliability_watermark', fields.Datetime.to_string(started_at))
+        return True
+
+    @api.model
+    def _refresh_statistics(self, equipment_ids=None):
+        """
+        Recompute the rows of ``equipment_ids`` (all equipment when None)
+        with one DELETE and one INSERT ... SELECT.
+
+        LAG() over the corrective requests of each equipment yields the time
+        since the previous failure; repair time falls back to end - start
+        when no duration was recorded.
+        """
+        cr = self.env.cr
+        params = {'uid': self.env.uid}
+        equipment_filter = ""
+        if equipment_ids is None:
+            cr.execute(f"DELETE FROM {self._table}")
+        else:
+            params['equipment_ids'] = list(equipment_ids)
+            equipment_filter = "AND r.equipment_id = ANY(%(equipment_ids)s)"
+            cr.execute(f"DELETE FROM {self._table} WHERE equipment_id = ANY(%(equipment_ids)s)", params)
+
+        cr.execute(f"""
+            INSERT INTO {self._table} (
+                equipment_id, category_id, team_id, month,
+                failure_count, repair_count, repair_hours, gap_count, gap_hours,
+                create_uid, create_date, write_uid, write_date
+            )
+            WITH requests AS (
+                SELECT r.equipment_id,
+                       r.category_id,
+                       r.team_id,
+                       r.request_type,
+                       r.state,
+                       r.request_date,
+                       COALESCE(
+                           NULLIF(r.duration, 0),
+                           EXTRACT(EPOCH FROM (r.end_date - r.start_date)) / 3600.0
+                       ) AS repair_hours,
+                       CASE WHEN r.request_type = 'corrective' THEN
+                           EXTRACT(EPOCH FROM (
+                               r.request_date - LAG(r.request_date) OVER (
+                                   PARTITION BY r.equipment_id, r.request_type
+                                   ORDER BY r.request_date, r.id
+                               )
+                           )) / 3600.0
+                       END AS gap_hours
+                  FROM ({self.env['maintenance.request.archive']._request_union_query()}) r
+                 WHERE r.active
+                   AND r.request_date IS NOT NULL
+                   {equipment_filter}
+            )
+            SELECT equipment_id,
+                   category_id,
+                   team_id,
+                   DATE_TRUNC('month', request_date)::date,
+                   COUNT(*) FILTER (WHERE request_type = 'corrective'),
+                   COUNT(*) FILTER (WHERE state = 'repaired' AND repair_hours IS NOT NULL),
+                   COALESCE(SUM(repair_hours) FILTER (WHERE state = 'repaired'), 0),
+                   COUNT(gap_hours),
+                   COALESCE(SUM(gap_hours), 0),
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM requests
+          GROUP BY equipment_id, category_id, team_id, DATE_TRUNC('month', request_date)
+        """, params)
+        self.invalidate_model()
+        return True
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Maintenance Request Report Model
+================================
+Read-only analysis model backing the pivot and graph reporting screens.
+
+Backed by a materialized SQL view that pre-joins requests with their
+equipment, category, team and technician and pre-computes month buckets
+and duration measures. Analysis screens aggregate over this compact
+table instead of the transactional maintenance_request table. Archived
+requests (maintenance.request.archive) are included.
+
+Database View: maintenance_request_report (MATERIALIZED)
+--------------------------------------------------------
+Refreshed by the "Refresh Maintenance Analysis" scheduled action or
+``action_refresh_report``.
+"""
+from odoo import models, fields, api, tools
+
+
+class MaintenanceRequestReport(models.Model):
+    _name = 'maintenance.request.report'
+    _description = 'Maintenance Request Analysis'
+    _auto = False
+    _order = 'request_date desc'
+
+    # ---------------------------
+    # Dimensions
+    # ---------------------------
+    # Exactly one of request_id / archive_id is set, depending on is_archived
+    request_id = fields.Many2one('maintenance.request', string='Request', readonly=True)
+    archive_id = fields.Many2one('maintenance.request.archive', string='Archived Request', readonly=True)
+    name = fields.Char(string='Subject', readonly=True)
+    equipment_id = fields.Many2one('maintenance.equipment', string='Equipment', readonly=True)
+    category_id = fields.Many2one('equipment.category', string='Equipment Category', readonly=True)
+    department_id = fields.Many2one('hr.department', string='Department', readonly=True)
+    team_id = fields.Many2one('maintenance.team', string='Maintenance Team', readonly=True)
+    technician_id = fields.Many2one('res.users', string='Assigned Technician', readonly=True)
+    request_type = fields.Selection(
+        selection=[
+            ('corrective', 'Corrective (Breakdown)'),
+            ('preventive', 'Preventive (Routine)')
+        ],
+        string='Maintenance Type',
+        readonly=True
+    )
+    state = fields.Selection(
+        selection=[
+            ('new', 'New'),
+            ('in_progress', 'In Progress'),
+            ('repaired', 'Repaired'),
+            ('scrap', 'Scrap')
+        ],
+        string='Stage',
+        readonly=True
+    )
+    priority = fields.Selection(
+        selection=[
+            ('0', 'Low'),
+            ('1', 'Normal'),
+            ('2', 'High'),
+            ('3', 'Urgent')
+        ],
+        string='Priority',
+        readonly=True
+    )
+    request_date = fields.Datetime(string='Request Date', readonly=True)
+    scheduled_date = fields.Datetime(string='Scheduled Date', readonly=True)
+    end_date = fields.Datetime(string='End Date', readonly=True)
+    request_month = fields.Date(string='Request Month', readonly=True)
+    end_month = fields.Date(string='Completion Month', readonly=True)
+    is_archived = fields.Boolean(string='Archived', readonly=True)
+
+    # ---------------------------
+    # Measures
+    # ---------------------------
+    nbr = fields.Integer(string='# Requests', readonly=True)
+    duration = fields.Float(string='Duration (Hours)', readonly=True)
+    lead_time = fields.Float(
+        string='Lead Time (Hours)',
+        readonly=True,
+        group_operator='avg',
+        help='Hours from request to completion'
+    )
+    delay = fields.Float(
+        string='Delay (Hours)',
+        readonly=True,
+        group_operator='avg',
+        help='Hours between scheduled date and completion (negative when early)'
+    )
+
+    # ---------------------------
+    # SQL View Definition
+    # ---------------------------
+    def _select(self):
+        return """
+            SELECT r.id AS id,
+                   CASE WHEN NOT r.is_archived THEN r.id END AS request_id,
+                   CASE WHEN r.is_archived THEN r.id END AS archive_id,
+                   r.name AS name,
+                   r.equipment_id AS equipment_id,
+                   COALESCE(r.category_id, e.category_id) AS category_id,
+                   e.department_id AS department_id,
+                   r.team_id AS team_id,
+                   r.technician_id AS technician_id,
+                   r.request_type AS request_type,
+                   r.state AS state,
+                   r.priority AS priority,
+                   r.request_date AS request_date,
+                   r.scheduled_date AS scheduled_date,
+                   r.end_date AS end_date,
+                   DATE_TRUNC('month', r.request_date)::date AS request_month,
+                   DATE_TRUNC('month', r.end_date)::date AS end_month,
+                   1 AS nbr,
+                   COALESCE(r.duration, 0) AS duration,
+                   EXTRACT(EPOCH FROM (r.end_date - r.request_date)) / 3600.0 AS lead_time,
+                   EXTRACT(EPOCH FROM (r.end_date - r.scheduled_date)) / 3600.0 AS delay,
+                   r.is_archived AS is_archived
+        """
+
+    def _from(self):
+        # Hot and archived requests together (see maintenance.request.archive)
+        return f"""
+              FROM ({self.env['maintenance.request.archive']._request_union_query()}) r
+              JOIN maintenance_equipment e ON e.id = r.equipment_id
+        """
+
+    def _where(self):
+        return """
+             WHERE r.active
+        """
+
+    def _query(self):
+        return f"{self._select()} {self._from()} {self._where()}"
+
+    def init(self):
+        """(Re)create the materialized view and its indexes."""
+        cr = self.env.cr
+        self.env['maintenance.request.archive']._create_archive_table()
+        cr.execute("SELECT relkind FROM pg_class WHERE relname = %s", [self._table])
+        row = cr.fetchone()
+        if row and row[0] == 'm':
+            cr.execute(f"DROP MATERIALIZED VIEW {self._table} CASCADE")
+        else:
+            tools.drop_view_if_exists(cr, self._table)
+        cr.execute(f"CREATE MATERIALIZED VIEW {self._table} AS ({self._query()})")
+        # The unique index allows REFRESH ... CONCURRENTLY
+        cr.execute(f"CREATE UNIQUE INDEX {self._table}_id_idx ON {self._table} (id)")
+        cr.execute(f"CREATE INDEX {self._table}_request_month_idx ON {self._table} (request_month)")
+
+    # ---------------------------
+    # Refresh
+    # ---------------------------
+    @api.model
+    def _refresh_report(self):
+        """Refresh the materialized view without blocking readers."""
+        self.env['maintenance.request'].flush_model()
+        self.env['maintenance.equipment'].flush_model()
+        self.env.cr.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self._table}")
+        self.env.invalidate_all()
+        return True
+
+    @api.model
+    def _cron_refresh_report(self):
+        """Cron job: Refresh the maintenance analysis data."""
+        return self._refresh_report()
+
+    @api.model
+    def action_refresh_report(self):
+        """Refresh the analysis data and reload the current view."""
+        self._refresh_report()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'reload',
+        }
@@ -6,12 +6,20 @@
  */
 
 import { registry } from "@web/core/registry";
-import { Component, useState, onWillStart } from "@odoo/owl";
+import { Component, useState, onWillStart, onMounted, onWillUnmount } from "@odoo/owl";
 import { useService } from "@web/core/utils/hooks";
 
+// Full reload of the statistics, catching changes no delta was sent for
+// (time-based overdue, SQL updates, missed notifications)
+const RESYNC_INTERVAL = 5 * 60 * 1000;
+
 /**
  * Dashboard Statistics Component
  * Shows real-time KPIs for maintenance management
+ *
+ * Statistics are loaded once, then kept current by the KPI deltas that
+ * request and equipment changes publish on the bus
+ * ("gearguard/dashboard_delta"), with a periodic full resync.
  */
 export class GearGuardDashboard extends Component {
     static template = "gearguard.Dashboard";
@@ -19,6 +27,7 @@ export class GearGuardDashboard extends Component {
     setup() {
         this.orm = useService("orm");
         this.action = useService("action");
+        this.busService = useService("bus_service");
         
         this.state = useState({
             totalEquipment: 0,
@@ -35,38 +44,41 @@ export class GearGuardDashboard extends Component {
         onWillStart(async () => {
             await this.loadStatistics();
         });
+
+        this.onDashboardDelta = this.onDashboardDelta.bind(this);
+        onMounted(() => {
+            this.busService.subscribe("gearguard/dashboard_delta", this.onDashboardDelta);
+            this.busService.start();
+            this.resyncInterval = setInterval(() => this.loadStatistics(), RESYNC_INTERVAL);
+        });
+        onWillUnmount(() => {
+            this.busService.unsubscribe("gearguard/dashboard_delta", this.onDashboardDelta);
+            clearInterval(this.resyncInterval);
+        });
+    }
+
+    /**
+     * Apply KPI changes published by the server, e.g.
+     * {deltas: {newRequests: -1, inProgressRequests: 1}}
+     */
+    onDashboardDelta({ deltas }) {
+        if (this.state.loading) {
+            return;
+        }
+        for (const [key, delta] of Object.entries(deltas)) {
+            if (key in this.state && key !== "loading") {
+                this.state[key] = Math.max(this.state[key] + delta, 0);
+            }
+        }
     }
     
     async loadStatistics() {
         try {
-            // Equipment stats
-            this.state.totalEquipment = await this.orm.searchCount(
-                "maintenance.equipment", []
-            );
-            this.state.activeEquipment = await this.orm.searchCount(
-                "maintenance.equipment", [["is_scrap", "=", false]]
-            );
-            this.state.scrappedEquipment = await this.orm.searchCount(
-                "maintenance.equipment", [["is_scrap", "=", true]]
-            );
-            
-            // Request stats
-            this.state.totalRequests = await this.orm.searchCount(
-                "maintenance.request", []
-            );
-            this.state.newRequests = await this.orm.searchCount(
-                "maintenance.request", [["state", "=", "new"]]
-            );
-            this.state.inProgressRequests = await this.orm.searchCount(
-                "maintenance.request", [["state", "=", "in_progress"]]
-            );
-            this.state.overdueRequests = await this.orm.searchCount(
-                "maintenance.request", [
-                    ["is_overdue", "=", true],
-                    ["state", "not in", ["repaired", "scrap"]]
-                ]
+            // All equipment and request KPIs in one call
+            const statistics = await this.orm.call(
+                "maintenance.request", "get_dashboard_statistics", []
             );
-            
+            Object.assign(this.state, statistics);
             this.state.loading = false;
         } catch (error) {
             console.error("Failed to load GearGuard statistics:", error);
@@ -10,6 +10,10 @@ Run specific test category:
     ./odoo-bin -c odoo.conf -d test_db --test-enable --test-tags gearguard_equipment
     ./odoo-bin -c odoo.conf -d test_db --test-enable --test-tags gearguard_request
     ./odoo-bin -c odoo.conf -d test_db --test-enable --test-tags gearguard_integration
+
+Run the index benchmark (large dataset, not part of the standard run):
+    ./odoo-bin -c odoo.conf -d test_db --test-enable --test-tags gearguard_benchmark
 """
 
 from . import test_gearguard
+from . import test_index_benchmark
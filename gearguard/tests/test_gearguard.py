@@ -9,8 +9,14 @@ Run tests with:
 """
 
 from odoo.tests import TransactionCase, tagged
+from odoo.addons.mail.tests.common import MockEmail
 from odoo.exceptions import ValidationError, UserError
 from datetime import date, datetime, timedelta
+import base64
+import io
+from collections import Counter
+
+from PIL import Image
 
 
 @tagged('gearguard', 'gearguard_equipment')
@@ -65,6 +71,82 @@ class TestMaintenanceTeam(TransactionCase):
         })
         self.assertIn(user, team.member_ids)
 
+    def test_auto_assign_least_loaded(self):
+        """Test new requests go to the least-loaded member, batches included."""
+        techs = self.User.create([{
+            'name': f'Balanced Tech {i}',
+            'login': f'balanced_tech_{i}@example.com',
+        } for i in range(3)])
+        team = self.Team.create({'name': 'Balanced Team', 'member_ids': [(6, 0, techs.ids)]})
+        equipment = self.env['maintenance.equipment'].create({
+            'name': 'Balanced Machine',
+            'team_id': team.id,
+            'technician_id': techs[0].id,
+        })
+        Request = self.env['maintenance.request']
+        Request.create({
+            'name': 'Big Job',
+            'equipment_id': equipment.id,
+            'technician_id': techs[0].id,
+            'estimated_hours': 8.0,
+        })
+        requests = Request.create([{
+            'name': f'Small Job {i}',
+            'equipment_id': equipment.id,
+            'estimated_hours': 2.0,
+        } for i in range(4)])
+        self.assertNotIn(techs[0], requests.technician_id)
+        self.assertEqual(
+            sorted(requests.mapped('technician_id.id')),
+            sorted([techs[1].id, techs[1].id, techs[2].id, techs[2].id]),
+        )
+
+        # An empty technician (as passed by the preventive generator) is balanced too
+        unassigned = Request.create({
+            'name': 'Generated Job',
+            'equipment_id': equipment.id,
+            'technician_id': False,
+        })
+        self.assertIn(unassigned.technician_id, techs[1:])
+
+    def test_rebalance_workload(self):
+        """Test the rebalance action spreads unstarted requests across members."""
+        techs = self.User.create([{
+            'name': f'Rebalance Tech {i}',
+            'login': f'rebalance_tech_{i}@example.com',
+        } for i in range(2)])
+        team = self.Team.create({'name': 'Rebalance Team', 'member_ids': [(6, 0, techs.ids)]})
+        equipment = self.env['maintenance.equipment'].create({'name': 'Rebalance Machine'})
+        requests = self.env['maintenance.request'].create([{
+            'name': f'Piled Job {i}',
+            'equipment_id': equipment.id,
+            'team_id': team.id,
+            'technician_id': techs[0].id,
+        } for i in range(4)])
+        team.action_rebalance_workload()
+        self.assertEqual(len(requests.filtered(lambda r: r.technician_id == techs[0])), 2)
+        self.assertEqual(len(requests.filtered(lambda r: r.technician_id == techs[1])), 2)
+
+    def test_open_request_count(self):
+        """Test open request counts per team and cache invalidation."""
+        team_a = self.Team.create({'name': 'Count Team A'})
+        team_b = self.Team.create({'name': 'Count Team B'})
+        equipment = self.env['maintenance.equipment'].create({'name': 'Count Machine'})
+        requests = self.env['maintenance.request'].create([
+            {'name': f'Count {i}', 'equipment_id': equipment.id, 'team_id': team_a.id}
+            for i in range(2)
+        ])
+        teams = team_a | team_b
+        self.assertEqual(teams.mapped('request_count'), [2, 0])
+
+        requests[0].write({'team_id': team_b.id})
+        teams.invalidate_recordset(['request_count'])
+        self.assertEqual(teams.mapped('request_count'), [1, 1])
+
+        requests[1].write({'active': False})
+        teams.invalidate_recordset(['request_count'])
+        self.assertEqual(teams.mapped('request_count'), [0, 1])
+
 
 @tagged('gearguard', 'gearguard_equipment')
 class TestMaintenanceEquipment(TransactionCase):
@@ -123,6 +205,44 @@ class TestMaintenanceEquipment(TransactionCase):
         })
         self.assertEqual(equipment.warranty_status, 'expired')
 
+    def test_warranty_status_refresh(self):
+        """Test the daily refresh expires warranties that passed their date."""
+        equipment = self.Equipment.create({
+            'name': 'Expires Tomorrow',
+            'warranty_expiry': date.today() + timedelta(days=1),
+        })
+        self.assertEqual(equipment.warranty_status, 'valid')
+        self.assertEqual(equipment.days_to_warranty_expiry, 1)
+
+        # Simulate the stored status freezing while the date passes
+        self.env.cr.execute(
+            "UPDATE maintenance_equipment SET warranty_expiry = %s WHERE id = %s",
+            [date.today() - timedelta(days=1), equipment.id],
+        )
+        equipment.invalidate_recordset(['warranty_expiry'])
+        self.assertEqual(equipment.days_to_warranty_expiry, -1)
+
+        self.Equipment._cron_refresh_warranty_status()
+        self.assertEqual(equipment.warranty_status, 'expired')
+        self.assertIn(equipment, self.Equipment.search([('days_to_warranty_expiry', '<', 0)]))
+
+    def test_warranty_days_search(self):
+        """Test searching days to warranty expiry agrees with the computed value."""
+        expiring, without = self.Equipment.create([
+            {'name': 'Expires Soon', 'warranty_expiry': date.today() + timedelta(days=5)},
+            {'name': 'No Warranty'},
+        ])
+        records = expiring | without
+        for operator, value in [('=', 0), ('!=', 0), ('<', 10), ('>', 0), ('>=', 5), ('!=', 5)]:
+            expected = records.filtered_domain([('days_to_warranty_expiry', operator, value)])
+            self.assertEqual(
+                self.Equipment.search([('id', 'in', records.ids), ('days_to_warranty_expiry', operator, value)]),
+                expected,
+                f'{operator} {value}',
+            )
+        with self.assertRaises(UserError):
+            self.Equipment.search([('days_to_warranty_expiry', '=', False)])
+
     def test_warranty_date_constraint(self):
         """Test that warranty date must be after purchase date."""
         with self.assertRaises(ValidationError):
@@ -132,6 +252,75 @@ class TestMaintenanceEquipment(TransactionCase):
                 'warranty_expiry': '2024-01-01',  # Before purchase
             })
 
+    def test_warranty_reminders_once_per_threshold(self):
+        """Test warranty reminders are sent once per threshold and queued as digests."""
+        owner = self.env['res.users'].create({
+            'name': 'Equipment Owner',
+            'login': 'gearguard_owner@example.com',
+            'email': 'gearguard_owner@example.com',
+        })
+        equipments = self.Equipment.create([{
+            'name': f'Expiring {days}',
+            'owner_id': owner.id,
+            'warranty_expiry': date.today() + timedelta(days=days),
+        } for days in (20, 5)])
+
+        self.Equipment._cron_check_warranty_expiry()
+        self.assertEqual(equipments.mapped('warranty_notified_threshold'), [30, 7])
+        mails = self.env['mail.mail'].sudo().search([
+            ('recipient_ids', 'in', owner.partner_id.ids),
+        ])
+        self.assertEqual(len(mails), 1)
+
+        self.Equipment._cron_check_warranty_expiry()
+        self.assertEqual(
+            self.env['mail.mail'].sudo().search_count([
+                ('recipient_ids', 'in', owner.partner_id.ids),
+            ]),
+            1,
+        )
+
+        equipments[0].warranty_expiry = date.today() + timedelta(days=10)
+        self.assertEqual(equipments[0].warranty_notified_threshold, 0)
+
+    def test_generate_preventive_maintenance(self):
+        """Test the preventive scheduler creates due requests exactly once."""
+        self.category.preventive_interval = 30
+        due = self.Equipment.create({
+            'name': 'Due Machine',
+            'category_id': self.category.id,
+            'team_id': self.team.id,
+            'purchase_date': date.today() - timedelta(days=60),
+        })
+        not_due = self.Equipment.create({
+            'name': 'Recent Machine',
+            'category_id': self.category.id,
+            'team_id': self.team.id,
+            'purchase_date': date.today(),
+        })
+        hours_based = self.Equipment.create({
+            'name': 'Hour Meter Machine',
+            'team_id': self.team.id,
+            'preventive_interval': 500,
+            'preventive_interval_unit': 'hours',
+            'running_hours': 650,
+        })
+        Request = self.env['maintenance.request']
+        domain = [('request_type', '=', 'preventive')]
+
+        self.Equipment._cron_generate_preventive_maintenance()
+        generated = Request.search(domain + [('equipment_id', 'in', (due | not_due | hours_based).ids)])
+        self.assertEqual(generated.equipment_id, due | hours_based)
+        # Left for the preventive planner to book
+        self.assertFalse(generated.filtered('scheduled_date'))
+        self.assertEqual(hours_based.running_hours_last_preventive, 650)
+
+        self.Equipment._cron_generate_preventive_maintenance()
+        self.assertEqual(
+            Request.search_count(domain + [('equipment_id', 'in', (due | hours_based).ids)]),
+            2,
+        )
+
     def test_scrap_equipment(self):
         """Test marking equipment as scrap."""
         equipment = self.Equipment.create({
@@ -142,6 +331,118 @@ class TestMaintenanceEquipment(TransactionCase):
         self.assertFalse(equipment.active)
         self.assertEqual(equipment.scrap_date, date.today())
 
+    def test_search_typeahead(self):
+        """Test ranked lookup by partial serial number and name."""
+        exact, prefix, inner = self.Equipment.create([
+            {'name': 'Dell Laptop', 'serial_number': 'DL-XPS'},
+            {'name': 'Dell Laptop 2', 'serial_number': 'DL-XPS-002'},
+            {'name': 'Spare DL-XPS Dock', 'serial_number': 'DOCK-001'},
+        ])
+        results = self.Equipment.search_typeahead('dl-xps')
+        self.assertEqual([r['id'] for r in results], [exact.id, prefix.id, inner.id])
+        self.assertEqual(self.Equipment.search_typeahead('DL-XPS', limit=1)[0]['id'], exact.id)
+        self.assertFalse(self.Equipment.search_typeahead('  '))
+
+        # Autocomplete matches serial numbers too
+        found = self.Equipment.name_search('XPS-002')
+        self.assertEqual([r[0] for r in found], [prefix.id])
+
+    def test_import_wizard(self):
+        """Test the streaming import creates valid rows and rejects the rest."""
+        self.Equipment.create({'name': 'Existing', 'serial_number': 'SN-EXIST'})
+        content = '\n'.join([
+            'name,serial_number,category,team,purchase_date',
+            f'Lathe,SN-001,{self.category.name},{self.team.name},2024-01-15',
+            'Press,SN-002,,,',
+            'Duplicate In File,SN-001,,,',
+            'Duplicate In DB,SN-EXIST,,,',
+            'Unknown Category,SN-003,Nope,,',
+            ',SN-004,,,',
+        ])
+        wizard = self.env['gearguard.equipment.import'].create({
+            'file': base64.b64encode(content.encode()),
+            'filename': 'equipment.csv',
+            'batch_size': 2,
+        })
+        wizard.action_import()
+        self.assertEqual(wizard.created_count, 2)
+        self.assertEqual(wizard.error_count, 4)
+        lathe = self.Equipment.search([('serial_number', '=', 'SN-001')])
+        self.assertEqual(lathe.name, 'Lathe')
+        self.assertEqual(lathe.category_id, self.category)
+        self.assertEqual(lathe.team_id, self.team)
+        rejected = base64.b64decode(wizard.error_file).decode().splitlines()
+        self.assertEqual(len(rejected), 5)
+        self.assertIn('Duplicate serial number: SN-EXIST', rejected[2])
+
+    def test_image_variants(self):
+        """Test thumbnails are stored when the photo is written, not when read."""
+        def make_image(width, height):
+            stream = io.BytesIO()
+            Image.new('RGB', (width, height), 'red').save(stream, format='PNG')
+            return base64.b64encode(stream.getvalue())
+
+        equipment = self.Equipment.create({
+            'name': 'Photographed Machine',
+            'image': make_image(2000, 1500),
+        })
+        Attachment = self.env['ir.attachment'].sudo()
+        variants = [
+            ('res_model', '=', 'maintenance.equipment'),
+            ('res_id', '=', equipment.id),
+            ('res_field', 'in', ['image_128', 'image_256', 'image_1024']),
+        ]
+        self.assertEqual(Attachment.search_count(variants), 3)
+
+        # The web client reads with bin_size: thumbnails must not depend on it
+        equipment.invalidate_recordset()
+        self.assertTrue(equipment.with_context(bin_size=True).image_128)
+        equipment.invalidate_recordset()
+        thumbnail = Image.open(io.BytesIO(base64.b64decode(equipment.image_128)))
+        self.assertLessEqual(max(thumbnail.size), 128)
+        self.assertEqual(Attachment.search_count(variants), 3)
+
+        equipment.write({'image': make_image(300, 300)})
+        self.assertEqual(Attachment.search_count(variants), 3)
+        thumbnail = Image.open(io.BytesIO(base64.b64decode(equipment.image_256)))
+        self.assertEqual(thumbnail.size, (256, 256))
+
+        # Data that is not an image is saved without thumbnails
+        equipment.write({'image': base64.b64encode(b'not an image')})
+        self.assertTrue(equipment.image)
+        self.assertEqual(Attachment.search_count(variants), 0)
+
+        # Photos stored without thumbnails get them from the backfill cron
+        equipment.write({'image': make_image(300, 300)})
+        Attachment.search(variants).unlink()
+        self.Equipment._cron_backfill_image_variants()
+        self.assertEqual(Attachment.search_count(variants), 3)
+        equipment.invalidate_recordset()
+        thumbnail = Image.open(io.BytesIO(base64.b64decode(equipment.image_128)))
+        self.assertEqual(thumbnail.size, (128, 128))
+
+    def test_bulk_create(self):
+        """Test bulk mode writes no per-record chatter and one summary."""
+        equipments = self.Equipment.bulk_create([{
+            'name': f'Bulk Machine {i}',
+            'category_id': self.category.id,
+            'team_id': self.team.id,
+        } for i in range(5)], batch_size=2, summary_record=self.team)
+        self.assertEqual(len(equipments), 5)
+        self.assertFalse(self.env['mail.message'].search_count([
+            ('model', '=', 'maintenance.equipment'),
+            ('res_id', 'in', equipments.ids),
+        ]))
+        self.assertFalse(equipments.message_follower_ids)
+        summary = self.team.message_ids.filtered(lambda m: 'Bulk load: 5' in m.body)
+        self.assertEqual(len(summary), 1)
+
+        equipments.with_context(gearguard_bulk_mode=True).write({'location': 'Plant 2'})
+        self.assertFalse(self.env['mail.tracking.value'].search_count([
+            ('mail_message_id.model', '=', 'maintenance.equipment'),
+            ('mail_message_id.res_id', 'in', equipments.ids),
+        ]))
+
 
 @tagged('gearguard', 'gearguard_request')
 class TestMaintenanceRequest(TransactionCase):
@@ -225,6 +526,58 @@ class TestMaintenanceRequest(TransactionCase):
         self.assertTrue(request.is_overdue)
         self.assertEqual(request.days_overdue, 5)
 
+    def test_overdue_search(self):
+        """Test overdue search follows scheduled date and state at query time."""
+        overdue, upcoming, done = self.Request.create([
+            {'name': 'Late', 'equipment_id': self.equipment.id,
+             'scheduled_date': datetime.now() - timedelta(days=1)},
+            {'name': 'Upcoming', 'equipment_id': self.equipment.id,
+             'scheduled_date': datetime.now() + timedelta(days=1)},
+            {'name': 'Late but done', 'equipment_id': self.equipment.id,
+             'scheduled_date': datetime.now() - timedelta(days=1), 'state': 'repaired'},
+        ])
+        records = overdue | upcoming | done
+        self.assertEqual(
+            self.Request.search([('id', 'in', records.ids), ('is_overdue', '=', True)]),
+            overdue,
+        )
+        self.assertEqual(
+            self.Request.search([('id', 'in', records.ids), ('is_overdue', '=', False)]),
+            upcoming | done,
+        )
+
+    def test_overdue_cron_notifies_once(self):
+        """Test the overdue cron logs a warning only once per request."""
+        request = self.Request.create({
+            'name': 'Overdue Once',
+            'equipment_id': self.equipment.id,
+            'scheduled_date': datetime.now() - timedelta(hours=3),
+        })
+
+        def overdue_notes():
+            return request.message_ids.filtered(lambda m: 'OVERDUE' in (m.body or ''))
+
+        self.Request._cron_check_overdue_requests()
+        self.assertEqual(len(overdue_notes()), 1)
+
+        request.invalidate_recordset(['message_ids'])
+        self.Request._cron_check_overdue_requests()
+        self.assertEqual(len(overdue_notes()), 1)
+
+        # Rescheduling to another past date warns again, as do late entries
+        late = self.Request.create({
+            'name': 'Entered Late',
+            'equipment_id': self.equipment.id,
+            'scheduled_date': datetime.now() - timedelta(days=10),
+        })
+        request.write({'scheduled_date': datetime.now() - timedelta(hours=1)})
+        self.assertFalse(request.overdue_notified_date)
+        self.Request._cron_check_overdue_requests()
+        request.invalidate_recordset(['message_ids'])
+        self.assertEqual(len(overdue_notes()), 2)
+        self.assertTrue(late.overdue_notified_date)
+        self.assertTrue(late.message_ids.filtered(lambda m: 'OVERDUE' in (m.body or '')))
+
     def test_duration_constraint(self):
         """Test that duration must be positive."""
         with self.assertRaises(Exception):
@@ -244,6 +597,45 @@ class TestMaintenanceRequest(TransactionCase):
         with self.assertRaises(UserError):
             request.action_start()  # Already in progress
 
+    def test_bulk_workflow_transitions(self):
+        """Test workflow actions on a multi-record set."""
+        requests = self.Request.create([
+            {'name': f'Bulk {i}', 'equipment_id': self.equipment.id} for i in range(3)
+        ])
+        requests.action_start()
+        self.assertEqual(set(requests.mapped('state')), {'in_progress'})
+        self.assertTrue(all(requests.mapped('start_date')))
+
+        requests.action_complete()
+        self.assertEqual(set(requests.mapped('state')), {'repaired'})
+        for request in requests:
+            self.assertIn(
+                'Maintenance work completed.',
+                request.message_ids.mapped('body')[0],
+            )
+
+    def test_bulk_complete_duration_per_record(self):
+        """Test completing several requests computes each one's own duration."""
+        requests = self.Request.create([
+            {'name': f'Duration {i}', 'equipment_id': self.equipment.id} for i in range(2)
+        ])
+        requests.action_start()
+        requests[0].write({'start_date': datetime.now() - timedelta(hours=2)})
+        requests[1].write({'start_date': datetime.now() - timedelta(hours=5)})
+        requests.action_complete()
+        self.assertAlmostEqual(requests[0].duration, 2, places=1)
+        self.assertAlmostEqual(requests[1].duration, 5, places=1)
+
+    def test_bulk_transition_validates_all_sources(self):
+        """Test a bulk transition fails without changes if one record is invalid."""
+        requests = self.Request.create([
+            {'name': f'Mixed {i}', 'equipment_id': self.equipment.id} for i in range(2)
+        ])
+        requests[0].action_start()
+        with self.assertRaises(UserError):
+            requests.action_start()
+        self.assertEqual(requests[1].state, 'new')
+
     def test_cannot_complete_non_progress_request(self):
         """Test that only in-progress requests can be completed."""
         request = self.Request.create({
@@ -272,6 +664,247 @@ class TestMaintenanceRequest(TransactionCase):
         request.action_assign_to_me()
         self.assertEqual(request.technician_id, self.env.user)
 
+    def test_double_booking_detection(self):
+        """Test overlapping bookings of one technician are flagged and free slots exclude them."""
+        tech = self.env['res.users'].create({
+            'name': 'Booked Tech',
+            'login': 'booked_tech@example.com',
+        })
+        day = datetime(2030, 3, 4)
+        first, overlapping, later = self.Request.create([{
+            'name': name,
+            'equipment_id': self.equipment.id,
+            'technician_id': tech.id,
+            'scheduled_date': day + timedelta(hours=start),
+            'estimated_hours': hours,
+        } for name, start, hours in (
+            ('Booking A', 9, 2.0),
+            ('Booking B', 10, 1.0),
+            ('Booking C', 13, 1.0),
+        )])
+        self.assertTrue(first.has_schedule_conflict)
+        self.assertTrue(overlapping.has_schedule_conflict)
+        self.assertFalse(later.has_schedule_conflict)
+        self.assertIn('Booking A', overlapping.message_ids[0].body)
+
+        overlapping.write({'scheduled_date': day + timedelta(hours=15)})
+        (first | overlapping).invalidate_recordset(['has_schedule_conflict'])
+        self.assertFalse(first.has_schedule_conflict)
+
+        slots = self.Request.get_free_slots(day, day + timedelta(days=1), technician_ids=[tech.id])
+        self.assertEqual(
+            [(slot['start'][11:16], slot['end'][11:16]) for slot in slots],
+            [('08:00', '09:00'), ('11:00', '13:00'), ('14:00', '15:00'), ('16:00', '17:00')],
+        )
+
+    def test_booking_bounds(self):
+        """Test booked slots follow the actual duration and never end before they start."""
+        start = datetime(2030, 3, 5, 9)
+        request = self.Request.create({
+            'name': 'Timed Booking',
+            'equipment_id': self.equipment.id,
+            'scheduled_date': start,
+            'estimated_hours': 1.0,
+        })
+        # Resizing the calendar slot updates the estimate
+        request.write({'planned_end_date': start + timedelta(hours=3)})
+        self.assertEqual(request.estimated_hours, 3.0)
+        request.write({'estimated_hours': 1.0})
+        self.assertEqual(request.planned_end_date, start + timedelta(hours=1))
+
+        with self.assertRaises(Exception):
+            request.write({'estimated_hours': -2.0})
+            request.flush_recordset()
+
+        request.action_start()
+        request.write({'start_date': datetime.now() - timedelta(hours=3)})
+        request.action_complete()
+        self.assertAlmostEqual(
+            (request.planned_end_date - start).total_seconds() / 3600.0,
+            request.duration, places=2,
+        )
+        self.assertGreater(request.duration, 2.9)
+
+    def test_kanban_data(self):
+        """Test the lean kanban endpoint limits columns and matches the ORM color."""
+        requests = self.Request.create([{
+            'name': f'Kanban {i}',
+            'equipment_id': self.equipment.id,
+            'priority': '3' if i == 0 else '1',
+        } for i in range(3)])
+        overdue = self.Request.create({
+            'name': 'Kanban Overdue',
+            'equipment_id': self.equipment.id,
+            'scheduled_date': datetime.now() - timedelta(days=2),
+        })
+        overdue.action_start()
+        domain = [('equipment_id', '=', self.equipment.id)]
+
+        columns = self.Request.get_kanban_data(domain, limit_per_column=2)
+        self.assertEqual([c['state'] for c in columns], ['new', 'in_progress', 'repaired', 'scrap'])
+        new_column = columns[0]
+        self.assertEqual(new_column['count'], 3)
+        self.assertEqual(len(new_column['records']), 2)
+        self.assertEqual(new_column['records'][0]['id'], requests[0].id)
+        self.assertEqual(new_column['records'][0]['color'], requests[0].color)
+        card = columns[1]['records'][0]
+        self.assertTrue(card['is_overdue'])
+        self.assertEqual(card['color'], overdue.color)
+        self.assertEqual(card['equipment_id'], (self.equipment.id, 'Test Equipment'))
+        self.assertEqual(columns[2], {'state': 'repaired', 'count': 0, 'records': []})
+
+    def test_schedule_preventive_requests(self):
+        """Test preventive requests are planned into free team hours without overlaps."""
+        techs = self.env['res.users'].create([{
+            'name': f'Planner Tech {i}',
+            'login': f'planner_tech_{i}@example.com',
+        } for i in range(2)])
+        team = self.env['maintenance.team'].create({'name': 'Planner Team', 'member_ids': [(6, 0, techs.ids)]})
+        day = datetime(2030, 6, 3)
+        self.Request.create({
+            'name': 'Existing Booking',
+            'equipment_id': self.equipment.id,
+            'technician_id': techs[0].id,
+            'scheduled_date': day + timedelta(hours=8),
+            'estimated_hours': 4.0,
+        })
+        category = self.env['equipment.category'].create({
+            'name': 'Planner Category',
+            'preventive_interval': 30,
+        })
+        machines = self.env['maintenance.equipment'].create([{
+            'name': f'Planner Machine {i}',
+            'category_id': category.id,
+            'team_id': team.id,
+            'purchase_date': date.today() - timedelta(days=60),
+        } for i in range(6)])
+        self.env['maintenance.equipment']._cron_generate_preventive_maintenance()
+        jobs = self.Request.search([('equipment_id', 'in', machines.ids)], order='equipment_id')
+        self.assertEqual(len(jobs), 6)
+        # Left to the planner, which picks the technician when it books them
+        self.assertFalse(jobs.technician_id)
+        jobs.write({'estimated_hours': 3.0})
+        jobs[5].priority = '3'
+
+        plan = self.Request._schedule_preventive_requests(day, day + timedelta(days=1), requests=jobs)
+        # 5 free hours for the first technician, 9 for the second: four 3-hour jobs fit
+        self.assertEqual(len(plan), 4)
+        self.assertIn(jobs[5].id, [request_id for request_id, *_ in plan])
+        planned = jobs.filtered('scheduled_date')
+        self.assertEqual(len(planned), 4)
+        self.assertFalse(planned.filtered(lambda r: r.technician_id not in techs))
+        self.assertFalse(planned.filtered(lambda r: r.scheduled_date < day + timedelta(hours=8)))
+        self.assertFalse(planned.filtered(lambda r: r.planned_end_date > day + timedelta(hours=17)))
+        self.assertFalse(planned.filtered('has_schedule_conflict'))
+        self.assertIn('preventive scheduler', planned[0].message_ids[0].body)
+
+    def test_dashboard_deltas(self):
+        """Test KPI deltas are queued only for the dashboards counting the records."""
+        def pending_deltas(target):
+            pending = self.env.cr.precommit.data.get('gearguard.dashboard_deltas', {})
+            return Counter(pending.get(target, {}))
+
+        member, outsider = self.env['res.users'].create([{
+            'name': name,
+            'login': f'{name.lower().replace(" ", "_")}@example.com',
+            'groups_id': [(6, 0, [self.env.ref('gearguard.group_gearguard_user').id])],
+        } for name in ('Delta Member', 'Delta Outsider')])
+        self.team.member_ids = [(4, member.id)]
+        managers = ('res.groups', self.env.ref('gearguard.group_gearguard_manager').id)
+        users = ('res.groups', self.env.ref('gearguard.group_gearguard_user').id)
+        targets = [managers, users, ('res.partner', member.partner_id.id), ('res.partner', outsider.partner_id.id)]
+
+        before = [pending_deltas(target) for target in targets]
+        request = self.Request.create({
+            'name': 'Delta Request',
+            'equipment_id': self.equipment.id,
+            'technician_id': member.id,
+        })
+        request.action_start()
+        equipment = self.env['maintenance.equipment'].create({'name': 'Delta Machine'})
+        equipment._scrap_batch()
+
+        deltas = []
+        for target, previous in zip(targets, before):
+            counters = pending_deltas(target)
+            counters.subtract(previous)
+            deltas.append({key: value for key, value in counters.items() if value})
+        manager_deltas, user_deltas, member_deltas, outsider_deltas = deltas
+        self.assertEqual(manager_deltas, {'totalRequests': 1, 'inProgressRequests': 1})
+        self.assertEqual(member_deltas, {'totalRequests': 1, 'inProgressRequests': 1})
+        self.assertEqual(outsider_deltas, {})
+        # Equipment is readable by all users: it nets to zero here (created, then scrapped)
+        self.assertEqual(user_deltas, {})
+
+    def test_dashboard_statistics(self):
+        """Test the single-call dashboard statistics match per-KPI counts."""
+        requests = self.Request.create([{
+            'name': f'Stats {i}',
+            'equipment_id': self.equipment.id,
+            'scheduled_date': datetime.now() - timedelta(days=1),
+        } for i in range(3)])
+        requests[0].action_start()
+        requests[1].action_start()
+        requests[1].action_complete()
+
+        stats = self.Request.get_dashboard_statistics()
+        Equipment = self.env['maintenance.equipment']
+        self.assertEqual(stats['totalEquipment'], Equipment.search_count([]))
+        self.assertEqual(stats['activeEquipment'], Equipment.search_count([('is_scrap', '=', False)]))
+        self.assertEqual(stats['totalRequests'], self.Request.search_count([]))
+        self.assertEqual(stats['newRequests'], self.Request.search_count([('state', '=', 'new')]))
+        self.assertEqual(stats['inProgressRequests'], self.Request.search_count([('state', '=', 'in_progress')]))
+        self.assertEqual(stats['overdueRequests'], self.Request.search_count([('is_overdue', '=', True)]))
+        self.assertEqual(stats['repairedThisMonth'], self.Request.search_count([
+            ('state', '=', 'repaired'),
+            ('end_date', '>=', self.Request._dashboard_month_start()),
+        ]))
+        self.assertGreaterEqual(stats['repairedThisMonth'], 1)
+
+
+@tagged('gearguard', 'gearguard_request')
+class TestOverdueReminders(TransactionCase, MockEmail):
+    """Test cases for the overdue reminder mailer."""
+
+    def setUp(self):
+        super().setUp()
+        self.Request = self.env['maintenance.request']
+        self.leader = self.env['res.users'].create({
+            'name': 'Team Leader',
+            'login': 'gearguard_leader@example.com',
+            'email': 'gearguard_leader@example.com',
+        })
+        self.team = self.env['maintenance.team'].create({
+            'name': 'Digest Team',
+            'leader_id': self.leader.id,
+        })
+        self.equipment = self.env['maintenance.equipment'].create({
+            'name': 'Digest Machine',
+            'team_id': self.team.id,
+        })
+
+    def test_overdue_digest_one_mail_per_recipient(self):
+        """Test all overdue requests of a recipient are sent in one queued mail."""
+        requests = self.Request.create([{
+            'name': f'Digest {i}',
+            'equipment_id': self.equipment.id,
+            'team_id': self.team.id,
+            'scheduled_date': datetime.now() - timedelta(days=2),
+        } for i in range(30)])
+
+        self.Request._cron_send_overdue_reminders()
+        mails = self.env['mail.mail'].sudo().search([
+            ('recipient_ids', 'in', self.leader.partner_id.ids),
+        ])
+        self.assertEqual(len(mails), 1)
+        self.assertEqual(mails.state, 'outgoing')
+        for request in requests:
+            self.assertIn(request.name, mails.body_html)
+
+        with self.mock_mail_gateway():
+            mails.send()
+        self.assertEqual(len(self._mails), 1)
+
 
 @tagged('gearguard', 'gearguard_integration')
 class TestIntegration(TransactionCase):
@@ -347,6 +980,129 @@ class TestIntegration(TransactionCase):
         self.assertTrue(equipment.is_scrap)
         self.assertFalse(equipment.active)
 
+    def test_bulk_scrap_cascade(self):
+        """Test scrapping many requests scraps each equipment once."""
+        equipments = self.Equipment.create([
+            {'name': f'Line Machine {i}'} for i in range(2)
+        ])
+        requests = self.Request.create([
+            {'name': 'Line A1', 'equipment_id': equipments[0].id},
+            {'name': 'Line A2', 'equipment_id': equipments[0].id},
+            {'name': 'Line B1', 'equipment_id': equipments[1].id},
+        ])
+        requests.action_scrap()
+        self.assertTrue(all(equipments.mapped('is_scrap')))
+        self.assertFalse(any(equipments.mapped('active')))
+        self.assertEqual(set(equipments.mapped('scrap_date')), {date.today()})
+
+        notes = equipments[0].message_ids.filtered(lambda m: 'Line A1' in (m.body or ''))
+        self.assertEqual(len(notes), 1)
+        self.assertIn('Line A2', notes.body)
+
+    def test_request_report_refresh(self):
+        """Test the analysis view picks up requests after a refresh."""
+        category = self.Category.create({'name': 'Report Category'})
+        equipment = self.Equipment.create({
+            'name': 'Report Machine',
+            'category_id': category.id,
+        })
+        self.Request.create([
+            {'name': f'Report {i}', 'equipment_id': equipment.id} for i in range(2)
+        ])
+        Report = self.env['maintenance.request.report']
+        Report._refresh_report()
+        groups = Report._read_group(
+            [('category_id', '=', category.id)], ['state'], ['nbr:sum'],
+        )
+        self.assertEqual(groups, [('new', 2)])
+
+    def test_archive_and_restore_requests(self):
+        """Test old closed requests move to the archive and can be restored."""
+        equipment = self.Equipment.create({'name': 'Archive Machine'})
+        team = self.env['maintenance.team'].create({'name': 'Archive Team'})
+        old, recent, open_request, old_team = self.Request.create([
+            {'name': 'Old Repair', 'equipment_id': equipment.id,
+             'scheduled_date': datetime(2020, 4, 1, 9), 'estimated_hours': 2.0},
+            {'name': 'Recent Repair', 'equipment_id': equipment.id},
+            {'name': 'Still Open', 'equipment_id': equipment.id},
+            {'name': 'Old Team Repair', 'equipment_id': equipment.id, 'team_id': team.id},
+        ])
+        (old | recent | old_team).write({'state': 'repaired'})
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE maintenance_request SET end_date = %s WHERE id = ANY(%s)",
+            [datetime(2020, 5, 1), [old.id, old_team.id]],
+        )
+        activity = old.activity_schedule(
+            'mail.mail_activity_data_todo', summary='Follow up', user_id=self.env.uid,
+        )
+        Archive = self.env['maintenance.request.archive']
+        Archive._cron_archive_closed_requests(months=12)
+
+        self.assertFalse(self.Request.search([('id', '=', old.id)]))
+        self.assertFalse(activity.exists())
+        self.assertEqual(
+            self.Request.search([('equipment_id', '=', equipment.id)]),
+            recent | open_request,
+        )
+        archived = Archive.browse(old.id)
+        self.assertEqual(archived.name, 'Old Repair')
+        self.assertEqual(archived.state, 'repaired')
+
+        # Reporting reads hot and archived rows together
+        Report = self.env['maintenance.request.report']
+        Report._refresh_report()
+        self.assertEqual(Report.search_count([('equipment_id', '=', equipment.id)]), 4)
+        archived_rows = Report.search([
+            ('equipment_id', '=', equipment.id), ('is_archived', '=', True),
+        ])
+        self.assertEqual(set(archived_rows.archive_id.ids), {old.id, old_team.id})
+        self.assertFalse(archived_rows.request_id)
+
+        # Archived requests still protect their equipment
+        with self.assertRaises(UserError):
+            equipment.unlink()
+
+        archived.action_restore()
+        self.assertFalse(Archive.search([('id', '=', old.id)]))
+        restored = self.Request.browse(old.id)
+        self.assertEqual(restored.name, 'Old Repair')
+        self.assertEqual(restored.planned_end_date, datetime(2020, 4, 1, 11))
+
+        # Requests whose team was deleted meanwhile are not restored
+        team.unlink()
+        with self.assertRaises(UserError):
+            Archive.browse(old_team.id).action_restore()
+
+    def test_reliability_metrics(self):
+        """Test MTTR/MTBF computed from the reliability statistics."""
+        category = self.Category.create({'name': 'Reliability Category'})
+        equipment = self.Equipment.create({
+            'name': 'Reliability Machine',
+            'category_id': category.id,
+        })
+        start = datetime(2024, 3, 1, 8, 0)
+        self.Request.create([{
+            'name': f'Failure {i}',
+            'equipment_id': equipment.id,
+            'category_id': category.id,
+            'request_type': 'corrective',
+            'request_date': start + timedelta(hours=100 * i),
+            'state': 'repaired',
+            'duration': 2.0 * (i + 1),
+        } for i in range(3)])
+        # History stays with the category recorded on the requests
+        equipment.category_id = self.Category.create({'name': 'New Category'})
+        Reliability = self.env['maintenance.reliability']
+        Reliability._cron_refresh_reliability(full=True)
+
+        metrics = Reliability.get_reliability_metrics(group_by='category')
+        metrics = [m for m in metrics if m['id'] == category.id]
+        self.assertEqual(len(metrics), 1)
+        self.assertEqual(metrics[0]['failures'], 3)
+        self.assertAlmostEqual(metrics[0]['mttr'], 4.0)
+        self.assertAlmostEqual(metrics[0]['mtbf'], 100.0)
+
     def test_smart_button_count(self):
         """Test that equipment smart button shows correct count."""
         equipment = self.Equipment.create({
@@ -372,3 +1128,60 @@ class TestIntegration(TransactionCase):
         
         # Count should decrease (only open requests)
         self.assertEqual(equipment.maintenance_count, 2)
+
+    def test_request_counts_for_recordset(self):
+        """Test open/total counts are computed correctly for many equipment at once."""
+        equipments = self.Equipment.create([
+            {'name': f'Batch Machine {i}'} for i in range(3)
+        ])
+        self.Request.create([
+            {'name': 'Open A', 'equipment_id': equipments[0].id},
+            {'name': 'Open B', 'equipment_id': equipments[0].id},
+            {'name': 'Done A', 'equipment_id': equipments[1].id, 'state': 'repaired'},
+        ])
+        equipments.invalidate_recordset(['maintenance_count', 'request_count'])
+        self.assertEqual(equipments.mapped('maintenance_count'), [2, 0, 0])
+        self.assertEqual(equipments.mapped('request_count'), [2, 1, 0])
+
+        with_open = self.Equipment.search([
+            ('id', 'in', equipments.ids),
+            ('maintenance_count', '>', 0),
+        ])
+        self.assertEqual(with_open, equipments[0])
+        without_open = self.Equipment.search([
+            ('id', 'in', equipments.ids),
+            ('maintenance_count', '=', 0),
+        ])
+        self.assertEqual(without_open, equipments[1:])
+
+    def test_stored_request_counters(self):
+        """Test the trigger-maintained counter mode matches the grouped counts."""
+        self.env['ir.config_parameter'].sudo().set_param(
+            'gearguard.stored_request_counters', 'True'
+        )
+        equipment = self.Equipment.create({'name': 'Counter Machine'})
+        requests = self.Request.create([
+            {'name': f'Counter {i}', 'equipment_id': equipment.id} for i in range(3)
+        ])
+        requests[0].action_start()
+        requests[0].action_complete()
+        equipment.invalidate_recordset(['maintenance_count', 'request_count'])
+        self.assertEqual(equipment.maintenance_count, 2)
+        self.assertEqual(equipment.request_count, 3)
+
+        # Turning the mode off drops the trigger; turning it on rebuilds the counters
+        self.env['ir.config_parameter'].sudo().set_param(
+            'gearguard.stored_request_counters', 'False'
+        )
+        self.env.cr.execute(
+            "SELECT 1 FROM pg_trigger WHERE tgname = 'gearguard_request_counter_trg'"
+        )
+        self.assertFalse(self.env.cr.rowcount)
+        requests[1].action_start()
+        requests[1].action_complete()
+        self.env['ir.config_parameter'].sudo().set_param(
+            'gearguard.stored_request_counters', 'True'
+        )
+        equipment.invalidate_recordset(['maintenance_count', 'request_count'])
+        self.assertEqual(equipment.maintenance_count, 1)
+        self.assertEqual(equipment.request_count, 3)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+GearGuard Index Benchmark
+=========================
+Loads a large synthetic dataset and checks that the kanban, calendar and
+smart-button queries are served by index scans.
+
+Not part of the standard run. Execute explicitly with:
+    ./odoo-bin -c odoo.conf -d test_db --test-enable --test-tags gearguard_benchmark
+
+The dataset size defaults to 1,000,000 requests and can be changed with the
+GEARGUARD_BENCH_REQUESTS environment variable.
+"""
+
+import json
+import logging
+import os
+import time
+
+from odoo.tests import TransactionCase, tagged
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('gearguard_benchmark', '-standard', '-at_install', 'post_install')
+class TestIndexBenchmark(TransactionCase):
+    """Query plans of the hot GearGuard queries on a large database."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.request_count = int(os.environ.get('GEARGUARD_BENCH_REQUESTS', 1000000))
+        equipment_count = max(cls.request_count // 100, 1)
+        cr = cls.env.cr
+        cls.team = cls.env['maintenance.team'].create({'name': 'Benchmark Team'})
+        cls.env.flush_all()
+
+        cr.execute("""
+            INSERT INTO maintenance_equipment (name, team_id, active, is_scrap, warranty_status)
+            SELECT 'Bench Equipment ' || g, %s, TRUE, FALSE, 'none'
+              FROM generate_series(1, %s) g
+         RETURNING id
+        """, [cls.team.id, equipment_count])
+        equipment_ids = [row[0] for row in cr.fetchall()]
+        cls.equipment_id = equipment_ids[0]
+
+        cr.execute("""
+            INSERT INTO maintenance_request (
+                name, equipment_id, team_id, technician_id, request_type, state,
+                priority, kanban_state, scheduled_date, request_date, active, duration
+            )
+            SELECT 'Bench Request ' || g,
+                   %(first)s + (g %% %(equipments)s),
+                   %(team)s,
+                   %(uid)s,
+                   CASE WHEN g %% 4 = 0 THEN 'preventive' ELSE 'corrective' END,
+                   (ARRAY['new', 'in_progress', 'repaired', 'repaired', 'repaired', 'scrap'])[1 + g %% 6],
+                   (g %% 4)::varchar,
+                   'normal',
+                   NOW() AT TIME ZONE 'UTC' - (g %% 1460) * INTERVAL '1 day',
+                   NOW() AT TIME ZONE 'UTC' - (g %% 1460) * INTERVAL '1 day',
+                   TRUE,
+                   0
+              FROM generate_series(1, %(count)s) g
+        """, {
+            'first': min(equipment_ids),
+            'equipments': equipment_count,
+            'team': cls.team.id,
+            'uid': cls.env.uid,
+            'count': cls.request_count,
+        })
+        cr.execute("ANALYZE maintenance_request")
+        cr.execute("ANALYZE maintenance_equipment")
+
+    def _explain(self, query, params):
+        """Return (plan node types, execution time in ms) of a query."""
+        self.env.cr.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", params)
+        plan = self.env.cr.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        plan = plan[0]
+
+        node_types = set()
+        stack = [plan['Plan']]
+        while stack:
+            node = stack.pop()
+            node_types.add(node['Node Type'])
+            stack.extend(node.get('Plans', []))
+        return node_types, plan['Execution Time']
+
+    def _assert_index_scan(self, label, query, params):
+        start = time.perf_counter()
+        node_types, execution_ms = self._explain(query, params)
+        _logger.info(
+            "GearGuard benchmark [%s] on %s requests: %.2f ms (plan: %s, wall %.2f ms)",
+            label, self.request_count, execution_ms, ', '.join(sorted(node_types)),
+            (time.perf_counter() - start) * 1000,
+        )
+        self.assertTrue(
+            node_types & {'Index Scan', 'Index Only Scan', 'Bitmap Index Scan'},
+            f'{label}: expected an index scan, got {sorted(node_types)}',
+        )
+        self.assertNotIn('Seq Scan', node_types, f'{label}: sequential scan on a hot path')
+
+    def test_kanban_column_query(self):
+        """Kanban column: one state, ordered like _order, first page."""
+        self._assert_index_scan('kanban', """
+            SELECT id FROM maintenance_request
+             WHERE active AND state = %s
+          ORDER BY state, priority DESC, scheduled_date, id DESC
+             LIMIT 80
+        """, ['in_progress'])
+
+    def test_calendar_query(self):
+        """Technician calendar: one month of open requests."""
+        self._assert_index_scan('calendar', """
+            SELECT id FROM maintenance_request
+             WHERE technician_id = %s
+               AND state IN ('new', 'in_progress')
+               AND scheduled_date >= (NOW() AT TIME ZONE 'UTC') - INTERVAL '30 days'
+               AND scheduled_date < NOW() AT TIME ZONE 'UTC'
+        """, [self.env.uid])
+
+    def test_smart_button_query(self):
+        """Equipment smart button: open requests of one equipment."""
+        self._assert_index_scan('smart button', """
+            SELECT COUNT(*) FROM maintenance_request
+             WHERE equipment_id = %s AND state IN ('new', 'in_progress')
+        """, [self.equipment_id])
+
+    def test_overdue_query(self):
+        """Overdue filter: open requests scheduled in the past."""
+        self._assert_index_scan('overdue', """
+            SELECT id FROM maintenance_request
+             WHERE state IN ('new', 'in_progress')
+               AND scheduled_date < (NOW() AT TIME ZONE 'UTC') - INTERVAL '1400 days'
+        """, [])
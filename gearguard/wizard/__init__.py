@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+from . import equipment_import
+from . import preventive_scheduler
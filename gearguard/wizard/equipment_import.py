@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+Equipment Import Wizard
+=======================
+Streaming CSV/XLSX import for maintenance.equipment.
+
+Rows are read lazily and processed in chunks of ``batch_size``:
+    - existing serial numbers are prefetched once into a set, so duplicates
+      (against the database or earlier rows of the file) are rejected
+      before they can fail a whole batch on ``serial_number_unique``
+    - category, team and department names are resolved through in-memory
+      maps built once per import
+    - valid rows are created with one ``create()`` per chunk in bulk mode
+      (no tracking/chatter); a failing chunk is retried row by row
+
+Rejected rows are written to a downloadable CSV with an ``error`` column.
+
+Expected columns (header row, case-insensitive):
+    name, serial_number, model, category, team, department, location,
+    purchase_date, warranty_expiry
+"""
+import base64
+import csv
+import io
+from datetime import datetime
+from itertools import islice
+
+from odoo import models, fields
+from odoo.exceptions import UserError
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+IMPORT_COLUMNS = (
+    'name', 'serial_number', 'model', 'category', 'team', 'department',
+    'location', 'purchase_date', 'warranty_expiry',
+)
+
+
+class EquipmentImport(models.TransientModel):
+    _name = 'gearguard.equipment.import'
+    _description = 'Equipment Import'
+
+    file = fields.Binary(string='File', required=True)
+    filename = fields.Char(string='File Name')
+    batch_size = fields.Integer(
+        string='Batch Size',
+        default=1000,
+        help='Number of equipment created per database batch'
+    )
+    state = fields.Selection(
+        selection=[('upload', 'Upload'), ('done', 'Done')],
+        default='upload'
+    )
+    created_count = fields.Integer(string='Created', readonly=True)
+    error_count = fields.Integer(string='Rejected', readonly=True)
+    error_file = fields.Binary(string='Rejected Rows', readonly=True, attachment=False)
+    error_filename = fields.Char(string='Rejected Rows File Name', readonly=True)
+
+    # ---------------------------
+    # Action
+    # ---------------------------
+    def action_import(self):
+        """Import the uploaded file and show the result."""
+        self.ensure_one()
+        if self.batch_size <= 0:
+            raise UserError('Batch size must be positive.')
+
+        Equipment = self.env['maintenance.equipment'].with_context(gearguard_bulk_mode=True)
+        lookups = self._prepare_lookups()
+        serials = self._get_existing_serials()
+        errors = io.StringIO()
+        error_writer = csv.writer(errors)
+        error_writer.writerow(('row',) + IMPORT_COLUMNS + ('error',))
+        created = rejected = 0
+
+        rows = self._iter_rows()
+        while True:
+            chunk = list(islice(rows, self.batch_size))
+            if not chunk:
+                break
+            valid = []
+            for row_number, row in chunk:
+                try:
+                    vals = self._prepare_equipment_vals(row, lookups, serials)
+                except UserError as e:
+                    rejected += 1
+                    error_writer.writerow(self._error_line(row_number, row, e.args[0]))
+                    continue
+                valid.append((row_number, row, vals))
+
+            chunk_created, chunk_errors = self._create_chunk(Equipment, valid)
+            created += chunk_created
+            for row_number, row, message in chunk_errors:
+                rejected += 1
+                error_writer.writerow(self._error_line(row_number, row, message))
+
+            # Keep the cache bounded on large files
+            Equipment.flush_model()
+            Equipment.invalidate_model()
+
+        if created:
+            Equipment._post_bulk_summary(created)
+        self.write({
+            'state': 'done',
+            'created_count': created,
+            'error_count': rejected,
+            'error_file': base64.b64encode(errors.getvalue().encode()) if rejected else False,
+            'error_filename': 'rejected_equipment.csv' if rejected else False,
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    # ---------------------------
+    # Reading
+    # ---------------------------
+    def _iter_rows(self):
+        """Yield (line number, row dict keyed by normalized column name)."""
+        data = base64.b64decode(self.file)
+        filename = (self.filename or '').lower()
+        if filename.endswith('.xlsx'):
+            rows = self._iter_xlsx(data)
+        elif filename.endswith('.csv') or not filename:
+            rows = csv.reader(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8-sig', newline=''))
+        else:
+            raise UserError('Unsupported file type: please upload a CSV or XLSX file.')
+
+        header = next(rows, None)
+        if not header:
+            raise UserError('The file is empty.')
+        columns = [str(column or '').strip().lower().replace(' ', '_') for column in header]
+        if 'name' not in columns:
+            raise UserError('The file must have a "name" column.')
+        for line_number, values in enumerate(rows, start=2):
+            if not any(value not in (None, '') for value in values):
+                continue
+            yield line_number, dict(zip(columns, values))
+
+    @staticmethod
+    def _iter_xlsx(data):
+        """Yield XLSX rows as tuples using openpyxl's read-only streaming mode."""
+        if openpyxl is None:
+            raise UserError('Importing XLSX files requires the openpyxl Python library.')
+        workbook = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+    # ---------------------------
+    # Lookups
+    # ---------------------------
+    def _prepare_lookups(self):
+        """Build name -> id maps for the related records, once per import."""
+        def name_map(model):
+            return {
+                record['name'].strip().lower(): record['id']
+                for record in self.env[model].search_read([], ['name'])
+                if record['name']
+            }
+        return {
+            'category': ('category_id', name_map('equipment.category')),
+            'team': ('team_id', name_map('maintenance.team')),
+            'department': ('department_id', name_map('hr.department')),
+        }
+
+    def _get_existing_serials(self):
+        """Return every serial number in use, archived equipment included."""
+        self.env['maintenance.equipment'].flush_model(['serial_number'])
+        self.env.cr.execute("""
+            SELECT serial_number FROM maintenance_equipment WHERE serial_number IS NOT NULL
+        """)
+        return {row[0] for row in self.env.cr.fetchall()}
+
+    # ---------------------------
+    # Validation
+    # ---------------------------
+    def _prepare_equipment_vals(self, row, lookups, serials):
+        """
+        Convert a row into create values, raising UserError for rows that
+        would be rejected by the model. Accepted serials are added to
+        ``serials`` so later duplicates in the file are rejected too.
+        """
+        name = self._cell(row, 'name')
+        if not name:
+            raise UserError('Missing equipment name.')
+        vals = {'name': name}
+
+        serial = self._cell(row, 'serial_number')
+        if serial:
+            if len(serial) < 3:
+                raise UserError('Serial number must be at least 3 characters long.')
+            if serial in serials:
+                raise UserError(f'Duplicate serial number: {serial}')
+            vals['serial_number'] = serial
+
+        for column in ('model', 'location'):
+            if self._cell(row, column):
+                vals[column] = self._cell(row, column)
+
+        for column, (field_name, ids_by_name) in lookups.items():
+            value = self._cell(row, column)
+            if not value:
+                continue
+            record_id = ids_by_name.get(value.lower())
+            if not record_id:
+                raise UserError(f'Unknown {column}: {value}')
+            vals[field_name] = record_id
+
+        for column in ('purchase_date', 'warranty_expiry'):
+            value = row.get(column)
+            if value in (None, ''):
+                continue
+            if isinstance(value, datetime):
+                value = value.date()
+            try:
+                vals[column] = fields.Date.to_date(value)
+            except (TypeError, ValueError):
+                raise UserError(f'Invalid date for {column}: {value}')
+        if vals.get('purchase_date') and vals.get('warranty_expiry') \
+                and vals['warranty_expiry'] < vals['purchase_date']:
+            raise UserError('Warranty expiry date must be after purchase date.')
+
+        if serial:
+            serials.add(serial)
+        return vals
+
+    @staticmethod
+    def _cell(row, column):
+        """Return a cell as a stripped string ('' when missing)."""
+        value = row.get(column)
+        return str(value).strip() if value is not None else ''
+
+    @staticmethod
+    def _error_line(row_number, row, message):
+        return [row_number] + [row.get(column, '') for column in IMPORT_COLUMNS] + [message]
+
+    # ---------------------------
+    # Creation
+    # ---------------------------
+    def _create_chunk(self, Equipment, valid):
+        """
+        Create a chunk in a single ``create()``. If the database rejects it,
+        retry row by row so only the offending rows are reported.
+
+        :return: (number created, [(row_number, row, error message)])
+        """
+        if not valid:
+            return 0, []
+        try:
+            with self.env.cr.savepoint():
+                Equipment.create([vals for _row_number, _row, vals in valid])
+            return len(valid), []
+        except Exception:
+            Equipment.invalidate_model()
+
+        created, errors = 0, []
+        for row_number, row, vals in valid:
+            try:
+                with self.env.cr.savepoint():
+                    Equipment.create(vals)
+                created += 1
+            except Exception as e:
+                Equipment.invalidate_model()
+                errors.append((row_number, row, str(e.args[0] if e.args else e)))
+        return created, errors
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Preventive Scheduler Wizard
+===========================
+Plans unscheduled preventive maintenance requests into technicians' free
+working hours over a horizon, on demand.
+
+The planning itself is done by
+``maintenance.request._schedule_preventive_requests``; the same engine runs
+daily from a scheduled action.
+"""
+from datetime import timedelta
+
+from odoo import models, fields
+from odoo.exceptions import UserError
+
+
+class PreventiveScheduler(models.TransientModel):
+    _name = 'gearguard.preventive.scheduler'
+    _description = 'Preventive Maintenance Scheduler'
+
+    date_from = fields.Datetime(
+        string='Plan From',
+        required=True,
+        default=lambda self: fields.Datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    )
+    horizon_days = fields.Integer(string='Horizon (Days)', required=True, default=14)
+    day_start = fields.Float(string='Workday Start', default=8.0)
+    day_end = fields.Float(string='Workday End', default=17.0)
+    team_ids = fields.Many2many(
+        'maintenance.team',
+        string='Teams',
+        help='Only plan requests of these teams (all teams when empty)'
+    )
+    state = fields.Selection(
+        selection=[('draft', 'Draft'), ('done', 'Done')],
+        default='draft'
+    )
+    planned_count = fields.Integer(string='Planned', readonly=True)
+    unplanned_count = fields.Integer(string='Not Planned', readonly=True)
+
+    # ---------------------------
+    # Action
+    # ---------------------------
+    def action_schedule(self):
+        """Plan the requests and show how many found a slot."""
+        self.ensure_one()
+        if self.horizon_days <= 0:
+            raise UserError('The horizon must be at least one day.')
+        if not 0 <= self.day_start < self.day_end <= 24:
+            raise UserError('The workday must start before it ends.')
+
+        Request = self.env['maintenance.request']
+        requests = Request.search(Request._get_unscheduled_preventive_domain(self.team_ids.ids))
+        plan = Request._schedule_preventive_requests(
+            self.date_from, self.date_from + timedelta(days=self.horizon_days),
+            requests=requests, day_start=self.day_start, day_end=self.day_end,
+        )
+        self.write({
+            'state': 'done',
+            'planned_count': len(plan),
+            'unplanned_count': len(requests) - len(plan),
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }